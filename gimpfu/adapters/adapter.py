@@ -7,7 +7,8 @@ is_test = False
 # See below, import Marshal selectively
 
 from gimpfu.adaption.wrappable import *
-from gimpfu.adaption.adapted_property import AdaptedProperty
+from gimpfu.adaption.adapted_property import AdaptedProperty, AdaptedPropertyDescriptor
+from gimpfu.adaption.adapted_method import AdaptedMethod
 
 from gimpfu.adapters.adapter_logger import AdapterLogger
 
@@ -27,7 +28,7 @@ Responsibilities:
         - property accesses on Adapted => Adaptee getter/setter functions
         - calls to undefined methods of Adapted => calls to Adaptee
 
-    equality of Adapted instances
+    equality and hash of Adapted instances
     copy Adapted instances
 
     expose the Adaptee instance  and its class_name to Adapted
@@ -54,19 +55,45 @@ class Adapter():
 
     def __init__(self, adaptee):
         # TODO can we log the subclass name here?
-        AdapterLogger.logger.info(f"New instance of subclass of Adapter for {adaptee}")
+        if AdapterLogger.log_switch.info:
+            AdapterLogger.logger.info("New instance of subclass of Adapter for %s", adaptee)
 
         if is_gimpfu_wrappable(adaptee):
             self._adaptee = adaptee
-            self._adaptee_callable = None
         else:
             raise Exception(f"Not wrappable: {adaptee}")
 
+        # So that Marshal.wrap() of the same adaptee returns self
+        from gimpfu.adaption.marshal import Marshal
+        Marshal.remember_wrapper(self)
+
 
     def __repr__(self):
         return f"<{self.__class__} of {self.adaptee_class_name}>"
 
 
+    def __init_subclass__(cls, **kwargs):
+        '''
+        When an AdaptedAdaptee class is created,
+        make its dynamic adapted properties into descriptors on the class,
+        and compute once the name sets that __getattr__ and __setattr__ consult.
+        '''
+        super().__init_subclass__(**kwargs)
+        AdaptedProperty.install_descriptors(cls)
+
+        # Totals of own class plus inherited classes, see Dynamic... methods
+        cls._writeable_property_names = frozenset(cls.DynamicWriteableAdaptedProperties())
+        cls._readonly_property_names  = frozenset(cls.DynamicReadOnlyAdaptedProperties())
+        cls._true_property_names      = frozenset(cls.DynamicTrueAdaptedProperties())
+        cls._adapted_property_names   = (cls._writeable_property_names
+                                        | cls._readonly_property_names
+                                        | cls._true_property_names)
+        cls._mapped_methods = dict(cls.DynamicMappedMethods())
+
+        # Per class, since mapped methods are per class
+        cls._resolutions = {}
+
+
 
 
     """
@@ -93,6 +120,14 @@ class Adapter():
     @classmethod
     def DynamicMappedMethods(cls):              return dict()
 
+    # Computed from the above by __init_subclass__, for each subclass
+    _writeable_property_names = frozenset()
+    _readonly_property_names  = frozenset()
+    _true_property_names      = frozenset()
+    _adapted_property_names   = frozenset()
+    _mapped_methods = {}
+    _resolutions = {}
+
 
 
 
@@ -101,7 +136,8 @@ class Adapter():
     '''
     def unwrap(self):
         ''' Return inner object, of a Gimp type, used when passing args back to Gimp'''
-        AdapterLogger.logger.debug(f"unwrap, from: {self._adaptee}, to gtype: {self.adaptee_gtype}")
+        if AdapterLogger.log_switch.debug:
+            AdapterLogger.logger.debug("unwrap, from: %s, to gtype: %s", self._adaptee, self.adaptee_gtype)
         return self._adaptee
 
     @property
@@ -117,41 +153,63 @@ class Adapter():
 
 
     '''
-    Equality and copy
+    Equality, hash, and copy
     '''
+
+    @property
+    def _identity(self):
+        '''
+        Key that identifies the adaptee: (type of adaptee, id of adaptee).
+
+        The id is Gimp's id, stable for the session, for adaptees that have one (Image, Item, Display.)
+        Else None, e.g. for RGB, a mutable value.
+        Computed once: an adapter never changes its adaptee.
+        '''
+        # avoid __getattr__, which would try the adaptee
+        result = self.__dict__.get('_identity_key')
+        if result is None:
+            adaptee = self.__dict__['_adaptee']
+            get_id = getattr(adaptee, 'get_id', None)
+            result = (type(adaptee), None if get_id is None else get_id())
+            object.__setattr__(self, '_identity_key', result)
+        return result
+
+
     def __eq__(self, other):
          '''
          Override equality operator.
 
-         This emanates from an "==" in Authors code.
-         GimpFu code usually does not compare adapted instances.
+         This emanates from an "==" in Authors code,
+         or from lookups in sets and dictionaries of adapted instances.
 
          Two Adapted instances are equal if:
-         - both have same superclass of Adapter
-         - AND their adaptee's are equal.
+         - they are the same instance (the usual case, see Marshal.wrap)
+         - OR their adaptees have the same type and Gimp id
+         - OR, for adaptees without an id, the adaptees are equal.
 
-         Require self and other both inherit Adapter, ow exception.
-         I.E. not general purpose equality such as: Layer instance == int instance
+         An Adapted instance is not equal to an instance of any other class.
+         I.E. Layer instance == int instance is False.
          '''
+         if self is other:
+             return True
+         if not isinstance(other, Adapter):
+             # Let Python try other.__eq__, else False
+             return NotImplemented
 
-         # We know self is an Adaptor, check other
-         try:
-            unwrapped_other = other.unwrap()
-         except AttributeError:
-            message = f"Fail __eq__, failed to unwrap other: {other}"
-            AdapterLogger.logger.info(message)
-            raise Exception(message)
+         identity = self._identity
+         if identity[1] is None:
+             return identity == other._identity and self._adaptee == other._adaptee
+         return identity == other._identity
 
-         try:
-             # Compare ID's or names instead?
-             # Could use public unwrap() for more generality
-             AdapterLogger.logger.info(f"Adaptor.__eq__ between unwrapped: {self} and {unwrapped_other}")
-             return self._adaptee == unwrapped_other
-         except:
-             # TODO define GimpFuException class of exceptions and do logging there
-             message = f"Fail __eq__ between: {self}, {other}"
-             AdapterLogger.logger.critical(message)
-             raise Exception(message)
+
+    def __hash__(self):
+        '''
+        Hash consistent with __eq__.
+
+        Adapted instances can be members of sets and keys of dictionaries.
+        For adaptees without an id, hashes only the type of the adaptee.
+        '''
+        return hash(self._identity)
 
 
 
@@ -204,36 +262,6 @@ class Adapter():
 
 
 
-    '''
-    Private
-    '''
-
-    def _adapter_func(self, *args):
-        ''' intercepts calls to previously accessed attribute '''
-
-        # This must be improved: for an arg is-a list, raises "unhashable type"
-        # Note that you can't unpack inside a fstring
-        # AdapterLogger.logger.debug(f"_adapter_func called, args: { {*args} }")
-
-        from gimpfu.adaption.marshal import Marshal
-
-        # arg could be a wrapped type, convert to unwrapped type i.e. foreign type
-        unwrapped_args = Marshal.unwrap_heterogenous_sequence(args)
-
-        # call the callable
-        # TODO Not sure why we need to use object.__...
-        unwrapped_result = object.__getattribute__(self, "_adaptee_callable")(*unwrapped_args)
-
-        # result could be a foreign type, convert to wrapped type, etc.
-        result = Marshal.wrap_adaptee_results(unwrapped_result)
-
-        # assert result is-a list of wrapped
-        return result
-
-
-
-
-
     '''
     __getattr and __setattr that adapt attributes: delegate to adaptee
     '''
@@ -249,7 +277,8 @@ class Adapter():
     '''
 
     def __getattr__(self, name):
-        AdapterLogger.logger.debug(f"__getattr__ called for: {name}")
+        if AdapterLogger.log_switch.debug:
+            AdapterLogger.logger.debug("__getattr__ called for: %s", name)
 
         '''
         Instance is AdaptedAdaptee (it inherits Adapter).
@@ -271,27 +300,15 @@ class Adapter():
         adaptee = self.__dict__['_adaptee']
 
         '''
-        Order is important:
-        Only use a name as a callable after
-        we determine that we are not adapting it as a true property.
+        Dynamic adapted properties are not handled here,
+        but by descriptors on the class, see AdaptedPropertyDescriptor.
         '''
-        if AdaptedProperty.is_dynamic_true_property_name(self, name):
-            result = AdaptedProperty.read(adaptee, name)
-        elif AdaptedProperty.is_callable_name_on_instance(adaptee, name):
-            adaptee_callable = getattr(self.__dict__['_adaptee'], name)
-            # Prepare for subsequent call
-            # avoid infinite recursion
-            object.__setattr__(self, "_adaptee_callable", adaptee_callable)
-            result = self._adapter_func
-        elif self.is_mapped_callable_name_on_instance(adaptee, name):
-            mapped_name = self.is_mapped_callable_name_on_instance(adaptee, name)
-            # assert mapped_name is_attr(_adaptee)
-            adaptee_callable = getattr(self.__dict__['_adaptee'], mapped_name)
-            # get callable for mapped_name
-            object.__setattr__(self, "_adaptee_callable", adaptee_callable)
-            result = self._adapter_func
-        elif AdaptedProperty.is_dynamic_readable_property_name(self, name):
-            result = AdaptedProperty.get(adaptee, name)
+        kind, adaptee_name = self._resolve_name(adaptee, name)
+        if kind is not Adapter._UNKNOWN:
+            # name on adaptee, or mapped name on adaptee
+            result = AdaptedMethod(name, getattr(adaptee, adaptee_name))
+            # Cache in instance dictionary: subsequent accesses don't call __getattr__
+            object.__setattr__(self, name, result)
         else:
             '''
             This error is hard to decipher.
@@ -302,7 +319,7 @@ class Adapter():
             msg = ( f"Name: {name} is not an attr of: {self.adaptee_class_name}"
                     f" OR error in property: {name} of: {type(self).__name__} ")
             raise AttributeError(msg)
-        # assert result is a value, or the callable adapter_func
+        # assert result is a value, or an AdaptedMethod
         return result
 
 
@@ -316,7 +333,7 @@ class Adapter():
         '''
         Special case: implementation of Adapter assigns to the few attributes of itself.
         '''
-        if name in ('_adaptee', '_adaptee_callable'):
+        if name in ('_adaptee', '_identity_key'):
             object.__setattr__(self, name, value)
             return
 
@@ -325,22 +342,27 @@ class Adapter():
         to attributes of an instance of Adapted(Adapter).
         '''
 
-        # avoid calling __getattr__
-        adaptee = self.__dict__['_adaptee']
-
         '''
+        Dynamic adapted properties: the descriptor sets,
+        or raises AttributeError when not writeable.
         DynamicTrueAdaptedProperties are not settable
         since adaptee only defines a getter i.e. <name>().
         If adaptee defines <name>() and set_<name>()
         Gimpfu must adapt specially, outside of this mechanism.
         '''
-        if AdaptedProperty.is_callable_name_on_instance(adaptee, name):
+        if name in self._adapted_property_names:
+            descriptor = getattr(type(self), name)
+            # Else a manually adapted property, without setter
+            if isinstance(descriptor, AdaptedPropertyDescriptor):
+                descriptor.__set__(self, value)
+                return
+
+        # avoid calling __getattr__
+        adaptee = self.__dict__['_adaptee']
+
+        if self._resolve_name(adaptee, name)[0] is Adapter._CALLABLE:
             # Adaptee's are Gimp objects, which have no assignable attributes, only callables ????
             raise AttributeError(f"Name {name} on {self.adaptee_class_name} is not assignable, only callable.")
-        elif AdaptedProperty.is_dynamic_writeable_property_name(self, name):
-            result = AdaptedProperty.set(adaptee, name, value)
-        elif AdaptedProperty.is_dynamic_readonly_property_name(self, name):
-            raise AttributeError(f"Attempt to assign to readonly attribute '{name}'")
         else:
             '''
             author is attempting to assign a new attribute
@@ -358,7 +380,42 @@ class Adapter():
             object.__setattr__(self, name, value)
             """
 
-        # assert result is a value, or the callable adapter_func
+
+    '''
+    Resolution of names that are not dynamic adapted properties.
+
+    Kinds:
+       callable: <name> is an attribute on adaptee, accessed like <name>()
+       mapped:   map(<name>) is an attribute on adaptee, see DynamicMappedMethods()
+       unknown:  neither
+    The kind depends only on the class of adapter, the type of adaptee, and the name,
+    so it is resolved once and cached per adapter class.
+    '''
+    _CALLABLE = 'callable'
+    _MAPPED   = 'mapped'
+    _UNKNOWN  = 'unknown'
+
+    def _resolve_name(self, adaptee, name):
+        ''' Return (kind, name of attribute on adaptee) for name accessed on self. '''
+        resolutions = type(self)._resolutions
+        key = (type(adaptee), name)
+        try:
+            return resolutions[key]
+        except KeyError:
+            pass
+
+        # Order is important: a name on adaptee takes precedence over a mapped name
+        if AdaptedProperty.is_callable_name_on_instance(adaptee, name):
+            result = (Adapter._CALLABLE, name)
+        else:
+            mapped_name = self.is_mapped_callable_name_on_instance(adaptee, name)
+            if mapped_name is not None:
+                result = (Adapter._MAPPED, mapped_name)
+            else:
+                result = (Adapter._UNKNOWN, None)
+        if AdapterLogger.log_switch.debug:
+            AdapterLogger.logger.debug("_resolve_name: %s on %s resolves to %s", name, type(adaptee).__name__, result)
+        resolutions[key] = result
         return result
 
 
@@ -368,7 +425,7 @@ class Adapter():
 
         Returns the mapped name, or None.
         '''
-        name_map = self.DynamicMappedMethods()
+        name_map = self._mapped_methods
         if name in name_map:
             result = name_map[name]
             # TODO we could check that result is an attribute of instance
@@ -1,5 +1,7 @@
 
 
+from gimpfu.logger.logger import FuLogSwitch
+
 import logging
 
 """
@@ -14,3 +16,5 @@ Adapter instance attributes such as 'logger' are hard because of the __setattr__
 class AdapterLogger:
 
     logger = logging.getLogger("GimpFu.Adaptor")
+    # Adapter.__init__ and __getattr__ are hot paths, see FuLogSwitch
+    log_switch = FuLogSwitch(logger)
@@ -95,3 +95,58 @@ class GimpfuDrawable( GimpfuItem ) :
         # slice off leading True
         result = offsets[1:]
         return result
+
+
+
+    '''
+    Pixels, as NumPy arrays.  See gimpfu/pixels.
+    Replaces v2 pixel regions.
+    '''
+
+    def get_array(self, rect=None, format=None):
+        '''
+        Return NumPy array of shape (height, width, channels) of pixels of rect.
+
+        rect is (x, y, width, height), default all of self.
+        format is a babl format name e.g. "R'G'B'A float", default self's color model in u8.
+        The array is read-only, copy it to modify it.
+        '''
+        from gimpfu.pixels.pixel_buffer import FuPixelBuffer
+        return FuPixelBuffer.get_array(self._adaptee, rect, format)
+
+
+    def set_array(self, array, x=0, y=0, format=None):
+        '''
+        Write NumPy array of pixels into self with its top left at (x, y).
+
+        Writes to the shadow buffer, then merges the shadow (undoable) and updates the written rectangle.
+        format default is self's color model in the sample type of the array's dtype.
+        '''
+        from gimpfu.pixels.pixel_buffer import FuPixelBuffer
+        FuPixelBuffer.set_array(self._adaptee, array, x, y, format)
+
+
+    def tiles(self, tile_size=256, rect=None, format=None, writable=True, halo=0):
+        '''
+        Return iterator of (rect, array) over tiles of self, in scan order, see FuTiles.
+
+        Tiles are read lazily, memory is bounded by the tile size.
+        A tile modified in place is written back by tiles.write(tile).
+        halo: r pixels of context around each tile, for neighbourhood filters.
+        '''
+        from gimpfu.pixels.tiles import FuTiles
+        return FuTiles(self._adaptee, tile_size, rect, format, writable, halo)
+
+
+    def parallel_map(self, func, tile_size=256, workers=None, format=None, rect=None, mode='process', halo=0):
+        '''
+        Apply func to each tile of self in a pool of workers, and write the results back.
+
+        func(tile) modifies a NumPy array in place, or returns an array of the same shape.
+        mode 'process': func must be defined at the top level of a module (picklable.)
+        mode 'thread': for func that releases the GIL (NumPy.)
+        halo: func gets r pixels of context around each tile, and returns only the core.
+        See FuParallel.
+        '''
+        from gimpfu.pixels.parallel import FuParallel
+        FuParallel.parallel_map(self._adaptee, func, tile_size, workers, format, rect, mode, halo)
@@ -7,6 +7,14 @@ from gimpfu.message.proceed import proceed
 
 from gimpfu.adapters.adapter import Adapter
 
+import functools
+
+# NumPy is optional, see FuBuffer
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 
 
 """
@@ -113,31 +121,47 @@ class GimpfuRGB(Adapter):
 
 
 
-    @classmethod
-    def create_RGB_from_string(cls, colorName):
-        """ Create a Gimp.RGB from a string. """
-        result = Gimp.RGB()
+    @staticmethod
+    @functools.lru_cache(maxsize=256)
+    def _components_of_name(colorName):
+        """ Return (r, g, b, a) of the color named colorName.
+
+        Cached: plugins use a few names, many times.
+        Caches the immutable components, not a Gimp.RGB,
+        since a Gimp.RGB is mutable and each caller gets its own.
+        """
+        parsed = Gimp.RGB()
         # TODO Gimp.RGB.parse_name does what when colorName invalid?
         # the GIR doc does not say what
-        # result.parse_name(colorName, -1)  # -1 means null terminated
+        # parsed.parse_name(colorName, -1)  # -1 means null terminated
         # TODO the GIR doc says len should be passed, possibly -1
         # The following doesn't seem to throw for invalid name.
-        result.parse_name(colorName)
+        parsed.parse_name(colorName)
+        return (parsed.r, parsed.g, parsed.b, parsed.a)
+
+    @classmethod
+    def create_RGB_from_string(cls, colorName):
+        """ Create a Gimp.RGB from a string. """
+        result = Gimp.RGB()
+        r, g, b, a = GimpfuRGB._components_of_name(colorName)
+        result.set(r, g, b)
+        result.set_alpha(a)
         return result
 
     @classmethod
     def create_RGB_from_tuple(cls, tuple):
         """ Create a Gimp.RGB from a tuple.
 
-        Expects a 3-tuple.
+        Expects a 3-tuple, or a 4-tuple whose last item is alpha.
         If tuple has less than three items, will raise Exception
-        If tuple has more than three items, will use the first three.
-        TODO alpha?
+        If tuple has more than four items, will use the first four.
         """
         result = Gimp.RGB()
         # upcast to type float when type int was passed
         # TODO Gimp.RGB.set does what when values are out of range ???
         result.set(float(tuple[0]), float(tuple[1]), float(tuple[2]) )
+        if len(tuple) > 3:
+            result.set_alpha(float(tuple[3]))
         return result
 
 
@@ -163,19 +187,72 @@ class GimpfuRGB(Adapter):
     def colors_from_list_of_python_type(cls, list):
         """ Create a list of Gimp.RGB from a list of  string or 3-tuple of ints.
 
+        Also from a numpy.ndarray of shape (N,3) or (N,4), rows are colors, column 3 is alpha.
+
         Convenience method on the class.
+
+        Palettes can be tens of thousands of colors.
+        Tuples and strings (the usual items) are converted in one loop,
+        without the dispatch of color_from_python_type per item.
         """
+        if numpy is not None and isinstance(list, numpy.ndarray):
+            return GimpfuRGB._colors_from_ndarray(list)
+
         result = []
+        # local names, for speed in the loop
+        append = result.append
+        new_RGB = Gimp.RGB
+        components_of_name = GimpfuRGB._components_of_name
+        item = None
         try:
             for item in list:
-                color = GimpfuRGB.color_from_python_type(item)
-                result.append(color)
+                item_type = type(item)
+                if item_type is tuple and len(item) == 3:
+                    color = new_RGB()
+                    color.set(float(item[0]), float(item[1]), float(item[2]))
+                elif item_type is str:
+                    r, g, b, a = components_of_name(item)
+                    color = new_RGB()
+                    color.set(r, g, b)
+                    color.set_alpha(a)
+                else:
+                    color = GimpfuRGB.color_from_python_type(item)
+                append(color)
         except:
             proceed(f"Failed to convert list element to Gimp.RGB: {item}.")
         # assert result is-a list of Gimp.RGB
         return result
 
 
+    @staticmethod
+    def _colors_from_ndarray(array):
+        """ Create a list of Gimp.RGB from a numpy.ndarray of shape (N,3) or (N,4), or (3,) or (4,) for one color. """
+        if array.ndim == 1:
+            array = array.reshape(1, -1)
+        if array.ndim != 2 or array.shape[1] not in (3, 4):
+            proceed(f"Array of colors must have shape (N,3) or (N,4), not: {array.shape}.")
+            return []
+
+        # one conversion for all items, to nested lists of Python float
+        rows = array.astype(numpy.float64, copy=False).tolist()
+
+        result = []
+        append = result.append
+        new_RGB = Gimp.RGB
+        if array.shape[1] == 3:
+            for r, g, b in rows:
+                color = new_RGB()
+                color.set(r, g, b)
+                append(color)
+        else:
+            for r, g, b, a in rows:
+                color = new_RGB()
+                color.set(r, g, b)
+                color.set_alpha(a)
+                append(color)
+        return result
+
+
     '''
     Properties
     '''
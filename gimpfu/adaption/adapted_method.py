@@ -0,0 +1,51 @@
+
+
+import logging
+
+
+class AdaptedMethod():
+    '''
+    A callable that adapts one method of one adaptee.
+
+    Returned by Adapter.__getattr__ for a name that is a callable on the adaptee
+    (or a mapped name, see DynamicMappedMethods.)
+    E.g. "layer.foo" returns an AdaptedMethod for adaptee.foo
+
+    Marshals: unwraps args on the way in, wraps results on the way out.
+
+    Bound: owns the adaptee's bound method,
+    so "f = layer.foo; g = layer.bar; f()" calls foo,
+    and nested calls e.g. "layer.foo(layer.bar())" are correct.
+    (Formerly Adapter kept the callable as instance state, shared by all accesses.)
+
+    Adapter caches an AdaptedMethod per instance and name,
+    so repeated "layer.foo()" does not repeat getattr on the GI object.
+    '''
+
+    __slots__ = ('name', '_adaptee_callable')
+
+    logger = logging.getLogger("GimpFu.AdaptedMethod")
+
+    def __init__(self, name, adaptee_callable):
+        self.name = name
+        self._adaptee_callable = adaptee_callable
+
+
+    def __repr__(self):
+        return f"<AdaptedMethod {self.name} of {self._adaptee_callable}>"
+
+
+    def __call__(self, *args):
+        # Note that you can't unpack inside a fstring
+        # AdaptedMethod.logger.debug(f"called, args: { {*args} }")
+
+        # avoid circular import, Marshal imports adapters
+        from gimpfu.adaption.marshal import Marshal
+
+        # arg could be a wrapped type, convert to unwrapped type i.e. foreign type
+        unwrapped_args = Marshal.unwrap_heterogenous_sequence(args)
+
+        unwrapped_result = self._adaptee_callable(*unwrapped_args)
+
+        # result could be a foreign type, convert to wrapped type, etc.
+        return Marshal.wrap_adaptee_results(unwrapped_result)
@@ -1,5 +1,7 @@
 
 
+from gimpfu.logger.logger import FuLogSwitch
+
 import logging
 
 
@@ -9,14 +11,15 @@ class AdaptedProperty():
 
     Properties on Adaptee must be called using call syntax (with parens)
     e.g. "foo = adaptee.get_property()" or "property()"
-    In the statement dynamically generated by this class.
+    In the call made by this class.
 
     Properties on AdaptedAdaptee use non-call syntax (without parens)
     e.g. "foo = adaptedAdaptee.property"
     In the Author's plugin source code.
 
-    An access to an AdaptedProperty is intercepted by the Python __getattr__
-    mechanism.
+    An access to an AdaptedProperty is handled by a descriptor
+    (AdaptedPropertyDescriptor) installed on the AdaptedAdaptee class
+    when the class is created.
 
     AdaptedProperty's are defined in AdaptedAdaptee's
     by a property name like "Dynamic..."
@@ -58,35 +61,30 @@ class AdaptedProperty():
     '''
 
     logger = logging.getLogger("GimpFu.AdaptedProperty")
+    log_switch = FuLogSwitch(logger)
 
     @classmethod
     def is_dynamic_writeable_property_name(cls, instance, name):
         ''' is name a writeable dynamic property on instance? '''
         ''' !!! instance is-a AdaptedAdaptee, not an Adaptee '''
 
-        # raises AttributeError if DynamicWriteableAdaptedProperties not defined by AdaptedAdaptee
-        #OLD delegated_property_names = getattr(instance, 'DynamicWriteableAdaptedProperties')
-        delegated_property_names = instance.DynamicWriteableAdaptedProperties()
-        # ensure delegated_property_names is not None, but could be empty
-        return name in delegated_property_names
+        # frozenset computed once per class by Adapter.__init_subclass__
+        return name in instance._writeable_property_names
 
 
     @classmethod
     def is_dynamic_readonly_property_name(cls, instance, name):
-        # raises AttributeError if DynamicWriteableAdaptedProperties not defined by AdaptedAdaptee
-        #OLD delegated_property_names = getattr(instance, 'DynamicReadOnlyAdaptedProperties')
-        delegated_property_names = instance.DynamicReadOnlyAdaptedProperties()
-        # ensure delegated_property_names is not None, but could be empty
-        return name in delegated_property_names
+        # frozenset computed once per class by Adapter.__init_subclass__
+        return name in instance._readonly_property_names
 
 
 
     @classmethod
     def is_dynamic_true_property_name(cls, instance, name):
         ''' Is <name> accessed like <name>() ? '''
-        delegated_property_names = instance.DynamicTrueAdaptedProperties()
-        result = name in delegated_property_names
-        AdaptedProperty.logger.debug(f"is_dynamic_true_property_name: {result} for name: {name} on instance: {instance}")
+        result = name in instance._true_property_names
+        if AdaptedProperty.log_switch.debug:
+            AdaptedProperty.logger.debug("is_dynamic_true_property_name: %s for name: %s on instance: %s", result, name, instance)
         return result
 
 
@@ -119,38 +117,30 @@ class AdaptedProperty():
 
     # Private
     @classmethod
-    def _eval_statement_on_adaptee(cls, adaptee, name, prefix = '', setting_value=None):
+    def _call_on_adaptee(cls, adaptee, name, prefix = '', setting_value=None):
         '''
-        Create and eval() a statement to access a method on adaptee
-        that looks like a property i.e. has no args.
+        Call a method on adaptee that looks like a property i.e. has no args,
+        or for a setter, one arg.
         '''
 
         assert prefix in ("get_", "set_", "")
 
-        # FUTURE rather than trust that DynamicReadOnlyAdaptedProperties is correct,
-        # preflight get_name on dictionary of adaptee
-        # So we can use a more specific error than AttributeError, e.g. "is not a *property* name"
-
-
         # Method on adaptee is like "[get,set]_name"
-        # Method on adaptee is a callable having no arguments
-        # eval occurs in current context, so formal args are in scope
+        method = getattr(adaptee, prefix + name)
         if prefix == 'set_':
-            # setStatement is a call with arg
-            statement = 'adaptee.set_' + name + '(setting_value)'
+            result = method(setting_value)
         else:
             # is a get (prefix is 'get_') or a read (prefix is '')
-            # getStatement is a call without arg
-            statement = 'adaptee.' + prefix + name + '()'
-        result = eval(statement)
-        AdaptedProperty.logger.debug(f"eval {statement} result: {result}")
+            result = method()
+        if AdaptedProperty.log_switch.debug:
+            AdaptedProperty.logger.debug("call %s%s result: %s", prefix, name, result)
         return result
 
 
     @classmethod
     def get(cls, adaptee, method_name ):
         ''' Call method_name of adaptee to get a property value. '''
-        unwrapped_result = cls._eval_statement_on_adaptee(adaptee, method_name, prefix = 'get_')
+        unwrapped_result = cls._call_on_adaptee(adaptee, method_name, prefix = 'get_')
         # !!! result can be a container of wrappable types.  Usually a fundamental type.
         from gimpfu.adaption.marshal import Marshal
         result = Marshal.wrap_adaptee_results(unwrapped_result)
@@ -161,10 +151,136 @@ class AdaptedProperty():
         ''' Call method_name of adaptee to set a property value. '''
         from gimpfu.adaption.marshal import Marshal
         unwrapped_value = Marshal.unwrap(value)
-        return cls._eval_statement_on_adaptee(adaptee, method_name, prefix = 'set_', setting_value = unwrapped_value)
+        return cls._call_on_adaptee(adaptee, method_name, prefix = 'set_', setting_value = unwrapped_value)
 
     @classmethod
     def read(cls, adaptee, method_name ):
         ''' Call method_name of adaptee to get a property value. '''
         # TODO marshal
-        return cls._eval_statement_on_adaptee(adaptee, method_name, prefix = '')
+        return cls._call_on_adaptee(adaptee, method_name, prefix = '')
+
+
+
+    '''
+    Precompiling AdaptedProperty's into descriptors.
+
+    When an AdaptedAdaptee class is created (see Adapter.__init_subclass__)
+    each name in its Dynamic... tuples becomes a descriptor on the class.
+    Then an access to the property is a normal Python attribute access,
+    not intercepted by __getattr__, and does not classify the name on every access.
+    '''
+
+    @classmethod
+    def install_descriptors(cls, adapted_class):
+        '''
+        Install an AdaptedPropertyDescriptor on adapted_class for each dynamic property name.
+
+        Order is precedence: true over writeable over readonly,
+        as in the classification by Adapter.__getattr__.
+
+        Does not replace a name defined in the class or a superclass
+        by other means, e.g. a manually adapted "@property".
+        Those take precedence, as they did over __getattr__.
+        '''
+        kinds = (
+            (AdaptedPropertyDescriptor.READONLY,  adapted_class.DynamicReadOnlyAdaptedProperties()),
+            (AdaptedPropertyDescriptor.WRITEABLE, adapted_class.DynamicWriteableAdaptedProperties()),
+            (AdaptedPropertyDescriptor.TRUE,      adapted_class.DynamicTrueAdaptedProperties()),
+            )
+        installed = {}
+        for kind, names in kinds:
+            for name in names:
+                installed[name] = kind
+
+        for name, kind in installed.items():
+            existing = cls._find_in_mro(adapted_class, name)
+            if existing is None or (isinstance(existing, AdaptedPropertyDescriptor) and existing.kind != kind):
+                setattr(adapted_class, name, AdaptedPropertyDescriptor(name, kind))
+                AdaptedProperty.logger.debug(f"install_descriptors {kind} {name} on {adapted_class.__name__}")
+
+
+    @staticmethod
+    def _find_in_mro(adapted_class, name):
+        ''' Return the attribute name as defined in the class dictionary of adapted_class or a superclass, else None. '''
+        for klass in adapted_class.__mro__:
+            if name in klass.__dict__:
+                return klass.__dict__[name]
+        return None
+
+
+
+class AdaptedPropertyDescriptor():
+    '''
+    A data descriptor for one AdaptedProperty on an AdaptedAdaptee class.
+
+    Calls the GI getter/setter of the adaptee directly.
+    The unbound GI function is looked up once per adaptee type,
+    e.g. Gimp.Layer.get_opacity, then called with the adaptee.
+    (An adapter of one class can have adaptees of several types e.g. GimpfuDrawable.)
+    '''
+
+    # kinds, see AdaptedProperty
+    READONLY  = 'readonly'   # get_<name>()
+    WRITEABLE = 'writeable'  # get_<name>() and set_<name>(value)
+    TRUE      = 'true'       # <name>()
+
+    def __init__(self, name, kind):
+        self.name = name
+        self.kind = kind
+        if kind == AdaptedPropertyDescriptor.TRUE:
+            self._getter_name = name
+        else:
+            self._getter_name = 'get_' + name
+        self._setter_name = 'set_' + name
+
+        # adaptee type => unbound GI function
+        self._getters = {}
+        self._setters = {}
+
+    def __repr__(self):
+        return f"<AdaptedPropertyDescriptor {self.kind} {self.name}>"
+
+
+    def _function_for(self, functions, adaptee, function_name):
+        ''' Return unbound function of type of adaptee, from cache functions, else AttributeError. '''
+        adaptee_type = type(adaptee)
+        try:
+            return functions[adaptee_type]
+        except KeyError:
+            pass
+
+        result = getattr(adaptee_type, function_name, None)
+        if result is None:
+            raise AttributeError(f"Name: {function_name} is not an attr of: {adaptee_type.__name__}")
+        functions[adaptee_type] = result
+        return result
+
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            # access on the class
+            return self
+
+        adaptee = instance.__dict__['_adaptee']
+        getter = self._function_for(self._getters, adaptee, self._getter_name)
+        result = getter(adaptee)
+        if self.kind != AdaptedPropertyDescriptor.TRUE:
+            # !!! result can be a container of wrappable types.  Usually a fundamental type.
+            # Not for TRUE kind, see AdaptedProperty.read()
+            from gimpfu.adaption.marshal import Marshal
+            result = Marshal.wrap_adaptee_results(result)
+        return result
+
+
+    def __set__(self, instance, value):
+        '''
+        DynamicTrueAdaptedProperties are not settable
+        since adaptee only defines a getter i.e. <name>().
+        '''
+        if self.kind != AdaptedPropertyDescriptor.WRITEABLE:
+            raise AttributeError(f"Attempt to assign to readonly attribute '{self.name}'")
+
+        from gimpfu.adaption.marshal import Marshal
+        adaptee = instance.__dict__['_adaptee']
+        setter = self._function_for(self._setters, adaptee, self._setter_name)
+        setter(adaptee, Marshal.unwrap(value))
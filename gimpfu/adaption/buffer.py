@@ -0,0 +1,168 @@
+
+from gimpfu.logger.logger import FuLogSwitch
+
+import array
+import logging
+
+# NumPy is optional.  GimpFu does not require it, but accepts ndarray when installed.
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+
+class FuBuffer():
+    '''
+    Understands Python objects that expose their contents as a buffer
+    (the buffer protocol, see memoryview.)
+    E.G. numpy.ndarray, array.array, memoryview, bytes, bytearray
+
+    For FuGenericValueArray, to pass a buffer to a Gimp.value_set_<foo>_array
+    without first building a Python list.
+
+    A singleton class, no instances.
+
+    And the reverse, for results of PDB procedures that are arrays of fundamental items.
+
+    Items are described by struct format characters, as used by memoryview and array.array:
+       'd' float64 (gdouble)   GimpFloatArray
+       'B' uint8   (guint8)    GimpUint8Array
+       'i' int32   (gint32)    GimpInt32Array   (C int is 32 bits on platforms Gimp supports)
+    '''
+
+    logger = logging.getLogger("GimpFu.FuBuffer")
+    log_switch = FuLogSwitch(logger)
+
+    # struct format char => numpy dtype
+    # !!! Native byte order, what Gimp expects
+    if numpy is not None:
+        _numpy_dtypes = {
+            'd' : numpy.float64,
+            'B' : numpy.uint8,
+            'i' : numpy.int32,
+            }
+    else:
+        _numpy_dtypes = {}
+
+    # Types always having the buffer protocol.
+    # Not str: Python thinks a str is a sequence, but we treat it as a single item
+    buffer_types = (bytes, bytearray, memoryview, array.array)
+    # Empty when numpy is not installed
+    ndarray_types = ()
+    if numpy is not None:
+        ndarray_types = (numpy.ndarray, )
+    buffer_types = buffer_types + ndarray_types
+
+
+    @staticmethod
+    def is_ndarray(obj):
+        ''' Is obj a numpy.ndarray?  False when numpy is not installed. '''
+        return numpy is not None and isinstance(obj, numpy.ndarray)
+
+
+    @staticmethod
+    def is_buffer(obj):
+        ''' Does obj have the buffer protocol? '''
+        if isinstance(obj, FuBuffer.buffer_types):
+            return True
+        if isinstance(obj, (str, list, tuple)) or obj is None:
+            # common case, not buffers, avoid the exception
+            return False
+        try:
+            memoryview(obj)
+        except TypeError:
+            return False
+        return True
+
+
+    @staticmethod
+    def typed_sequence(obj, format):
+        '''
+        Return a flat, C-contiguous memoryview of obj, whose items have struct format.
+
+        Does not copy when obj already is contiguous items of format,
+        e.g. numpy.ndarray of dtype float64, or array.array('d'), for format 'd'.
+        Else copies once, coercing item type, e.g. float32 or int to float64.
+
+        A memoryview is a sequence, PyGObject marshals it to a C array
+        as it would a list, but without the intermediate list.
+
+        Multi-dimensional obj is flattened in C order.
+
+        !!! Except for format 'B', returns bytes.
+        PyGObject copies bytes into a guint8 C array in one memcpy,
+        but marshals any other sequence item by item.
+        So bytes pass unchanged, and other buffers are copied once to bytes.
+        '''
+        if format == 'B' and isinstance(obj, bytes):
+            return obj
+        result = FuBuffer._typed_memoryview(obj, format)
+        if format == 'B':
+            result = result.tobytes()
+        return result
+
+
+    @staticmethod
+    def _typed_memoryview(obj, format):
+        ''' Return a flat, C-contiguous memoryview of obj, whose items have struct format. '''
+        if FuBuffer.is_ndarray(obj):
+            # ascontiguousarray copies only when dtype or layout differs
+            flat = numpy.ascontiguousarray(obj, dtype=FuBuffer._numpy_dtypes[format]).reshape(-1)
+            return memoryview(flat)
+
+        view = memoryview(obj)
+        if view.ndim != 1:
+            item_format = view.format
+            if not view.c_contiguous:
+                # copy, in C order
+                view = memoryview(view.tobytes())
+            # flatten
+            view = view.cast('B').cast(item_format)
+
+        if view.format == format and view.c_contiguous and view.ndim == 1:
+            result = view
+        else:
+            if FuBuffer.log_switch.info:
+                FuBuffer.logger.info("typed_sequence coerce format: %s to: %s", view.format, format)
+            # Copy, converting each item.  tolist() is flat since view is 1-D
+            result = memoryview(array.array(format, view.tolist()))
+        return result
+
+
+
+    """
+    Results.
+
+    PyGObject returns a C array of fundamental items as a list (or bytes, for guint8.)
+    GimpFu returns compact buffers instead, symmetric to what it accepts as args:
+       GimpUint8Array => bytes
+       GimpInt32Array => memoryview of int32 (format 'i')
+    Each is a sequence (len, index, iterate) and a buffer (numpy.frombuffer does not copy.)
+    """
+
+    @staticmethod
+    def from_array_result(item, format):
+        '''
+        Return item, a result of a PDB procedure, as a buffer of items of struct format.
+
+        Returns item unchanged when it is not a sequence of items,
+        e.g. None, or an opaque GBoxed.
+        '''
+        if format == 'B':
+            if isinstance(item, bytes):
+                return item
+            if isinstance(item, (list, tuple, bytearray, memoryview)):
+                try:
+                    return bytes(item)
+                except (TypeError, ValueError):
+                    pass
+        elif isinstance(item, (list, tuple)):
+            try:
+                return memoryview(array.array(format, item))
+            except (TypeError, OverflowError):
+                pass
+
+        if FuBuffer.log_switch.info:
+            FuBuffer.logger.info("from_array_result passes: %s", type(item))
+        return item
@@ -28,11 +28,23 @@ class GimpFuMap(Mapping):
     Dictionary syntax:  new_name = gimpFuMap[name]
 
     Subclasses may do additional alterations to name.
+
+    Memoizes: each key is resolved once.
+    Memoizes negative results (key not in map, i.e. not renamed) too,
+    since most names are not renamed.
+    Tells Author of a deprecated name once, but counts every use of it.
+    See statistics().
     '''
 
     def __init__(self, map):
-        # replace wrapped dict
-        self.__dict__ = map
+        # wrapped dict of renamings
+        self._map = map
+        # key => (resolved name, deprecated name or None)
+        self._resolved = {}
+        # deprecated name => count of uses
+        self._deprecated_uses = {}
+        self._hits = 0
+        self._misses = 0
 
     '''
     Implement abstract methods of Mapping
@@ -43,14 +55,68 @@ class GimpFuMap(Mapping):
         If the key is not in the wrapped dictionary, return unmapped key
         If key is in dictionary, return mapped and tell author of deprecated.
         '''
-        # TODO implement with except KeyError: would be faster?
-        if key in self.__dict__.keys():
-            Deprecation.say(f"Deprecated name: {key}")
-            return self.__dict__[key]
-        else:
-            return key
+        result, deprecated_name = self.resolve(key)
+        if deprecated_name is not None:
+            self.count_use(deprecated_name)
+        return result
+
+
+    def resolve(self, key):
+        '''
+        Return tuple (resolved name, deprecated name or None) for key, memoized.
+        Does not count a use: for callers that cache the result and count each use,
+        see count_use().
+        '''
+        try:
+            resolution = self._resolved[key]
+            self._hits += 1
+        except KeyError:
+            self._misses += 1
+            resolution = self._resolve(key)
+            self._resolved[key] = resolution
+            if resolution[1] is not None:
+                # Only the first use, the count is in statistics()
+                Deprecation.say(f"Deprecated name: {resolution[1]}")
+        return resolution
+
+
+    def count_use(self, deprecated_name):
+        ''' Count a use of deprecated_name, for statistics(). '''
+        self._deprecated_uses[deprecated_name] = self._deprecated_uses.get(deprecated_name, 0) + 1
+
+
+    def _resolve(self, key):
+        '''
+        Return tuple (resolved name, deprecated name or None) for key.
+        Not memoized, see __getitem__.
+        '''
+        try:
+            return self._map[key], key
+        except KeyError:
+            return key, None
 
 
+    def statistics(self):
+        '''
+        Return dictionary of statistics of use of self.
+
+        'hits', 'misses' : memoized or not
+        'deprecated' : dictionary deprecated name => count of uses
+        I.E. which legacy names an Author's plugin still uses, and how often.
+        '''
+        return {
+            'hits'       : self._hits,
+            'misses'     : self._misses,
+            'deprecated' : dict(self._deprecated_uses),
+            }
+
+
+    def clear_statistics(self):
+        ''' Forget statistics, but not the memoized names. '''
+        self._deprecated_uses.clear()
+        self._hits = 0
+        self._misses = 0
+
 
     def __iter__(self):
         raise NotImplementedError("Compat iterator.")
@@ -78,10 +144,10 @@ class GimpFuPDBMap(GimpFuMap):
     The names in the PDB use hyphens, which Python does not allow in symbols.
     Super() will then map deprecated names.
     '''
-    def __getitem__(self, key):
+    def _resolve(self, key):
         hyphenized_key = key.replace( '_' , '-')
         # !!! The map must use hyphenated strings
-        return super().__getitem__(hyphenized_key)
+        return super()._resolve(hyphenized_key)
 
 
 
@@ -173,3 +239,27 @@ def get_name_map_for_adaptee_class(class_name):
     When you develop an adapter, add class_name to map_map
     '''
     return map_map[class_name]
+
+
+def _all_name_maps():
+    ''' Return dictionary, name of map => GimpFuMap '''
+    result = {
+        'PDB'  : pdb_name_map,
+        'Gimp' : gimp_name_map,
+        }
+    result.update(map_map)
+    return result
+
+
+def get_name_map_statistics():
+    '''
+    Return dictionary, name of map => statistics of the map.  See GimpFuMap.statistics()
+
+    Also in get_message_summary(), and the deprecated names are in the printed summary of deprecations.
+    '''
+    return { map_name : name_map.statistics() for map_name, name_map in _all_name_maps().items() }
+
+
+def clear_name_map_statistics():
+    for name_map in _all_name_maps().values():
+        name_map.clear_statistics()
@@ -0,0 +1,75 @@
+
+import gi
+from gi.repository import Gio   # Gio.File
+
+from gimpfu.logger.logger import FuLogSwitch
+
+from collections import OrderedDict
+import logging
+import os
+
+
+
+class FuFileCache():
+    '''
+    A bounded cache of Gio.File, keyed by normalized path.
+
+    For args to PDB procedures whose formal type is GFile e.g. gimp-file-load, gimp-file-save.
+    Plugins that export in a loop pass the same paths many times.
+
+    A Gio.File is immutable (a reference to a path, not an open file)
+    so the same Gio.File can be passed to many calls.
+
+    Least recently used entries are evicted when the cache is full.
+
+    Accepts str or os.PathLike (e.g. pathlib.Path).
+    The key is the absolute, normalized path,
+    so "foo/../bar.png" and "bar.png" are the same entry,
+    and a relative path is relative to the current directory when first passed,
+    as for Gio.file_new_for_path.
+
+    A singleton class, no instances.
+    '''
+
+    logger = logging.getLogger("GimpFu.FuFileCache")
+    log_switch = FuLogSwitch(logger)
+
+    max_entries = 256
+
+    # normalized path => Gio.File, in order of use
+    _files = OrderedDict()
+
+
+    @staticmethod
+    def is_path(obj):
+        ''' Is obj a path, i.e. str or os.PathLike ? '''
+        return isinstance(obj, (str, os.PathLike))
+
+
+    @staticmethod
+    def gfile_for(path):
+        '''
+        Return a Gio.File for path, a str or os.PathLike.
+
+        Raises TypeError when path is not a path.
+        '''
+        key = os.path.normpath(os.path.abspath(os.fspath(path)))
+        files = FuFileCache._files
+        result = files.get(key)
+        if result is not None:
+            files.move_to_end(key)
+            return result
+
+        result = Gio.file_new_for_path(key)
+        if result is not None:
+            files[key] = result
+            if len(files) > FuFileCache.max_entries:
+                files.popitem(last=False)
+        if FuFileCache.log_switch.info:
+            FuFileCache.logger.info("gfile_for new GFile: %s", key)
+        return result
+
+
+    @staticmethod
+    def clear():
+        FuFileCache._files.clear()
@@ -1,6 +1,9 @@
 
 import gi
 from gi.repository import GObject    # GObject type constants
+from gi.repository import Gio        # Gio.File
+
+from gimpfu.logger.logger import FuLogSwitch
 
 import logging
 
@@ -32,6 +35,7 @@ class FormalTypes():
     '''
 
     logger = logging.getLogger("GimpFu.FormalTypes")
+    log_switch = FuLogSwitch(logger)
 
     """
     These classify groups/sets of typenames.
@@ -66,6 +70,11 @@ class FormalTypes():
     def is_string_array_type(type_name):   return type_name in ('GParamBoxed', )
     def is_color_array_type(type_name):   return type_name in ('GimpParamRGBArray', 'GimpRGBArray')
 
+    @staticmethod
+    def is_file_value_type(value_type):
+        ''' Is value_type (of a GParamSpec, e.g. <GType GFile>) a GFile?  Precise, unlike is_file_descriptor_type. '''
+        return value_type.is_a(Gio.File.__gtype__)
+
     def is_file_descriptor_type(type_name):
         # ??? PDB Browser says 'GFile' but is 'GParamObject'
         # TODO this might be too general, could catch other param types?
@@ -89,7 +98,8 @@ class FormalTypes():
 
         mangled_formal_type_name = formal_type_name.replace('GimpParam', '')
         result = mangled_formal_type_name == actual_type_name
-        FormalTypes.logger.debug(f"{result}    formal {formal_type_name} == actual {actual_type_name}")
+        if FormalTypes.log_switch.debug:
+            FormalTypes.logger.debug("%s    formal %s == actual %s", result, formal_type_name, actual_type_name)
         return result
 
     @staticmethod
@@ -11,6 +11,7 @@ from gimpfu.message.proceed import proceed
 from gimpfu.message.suggest import Suggest
 
 from gimpfu.adaption.generic_value_array import FuGenericValueArray
+from gimpfu.adaption.file_cache import FuFileCache
 from gimpfu.adaption.types import Types
 from gimpfu.adaption.upcast import Upcast
 
@@ -417,19 +418,22 @@ class FuGenericValue():
     # Arrays of primitives
 
     def to_float_array(self):
-        self._gvalue = FuGenericValueArray.to_gimp_array(self.actual_arg, Gimp.FloatArray.__gtype__, Gimp.value_set_float_array )
+        self._gvalue = FuGenericValueArray.to_gimp_array(self.actual_arg, Gimp.FloatArray.__gtype__, Gimp.value_set_float_array,
+                           buffer_format='d')
         self._did_create_gvalue = True
         self._did_convert = True
 
     def to_uint8_array(self):
         """ Make self's GValue hold a GimpUint8Array created from self.actual_arg"""
-        self._gvalue = FuGenericValueArray.to_gimp_array(self._actual_arg, Gimp.Uint8Array.__gtype__, Gimp.value_set_uint8_array )
+        self._gvalue = FuGenericValueArray.to_gimp_array(self._actual_arg, Gimp.Uint8Array.__gtype__, Gimp.value_set_uint8_array,
+                           buffer_format='B')
         self._did_create_gvalue = True
         self._did_convert = True
 
     def to_int32_array(self):
         """ Make self's GValue hold a GimpInt32Array created from self.actual_arg"""
-        self._gvalue = FuGenericValueArray.to_gimp_array(self._actual_arg, Gimp.Int32Array.__gtype__, Gimp.value_set_int32_array )
+        self._gvalue = FuGenericValueArray.to_gimp_array(self._actual_arg, Gimp.Int32Array.__gtype__, Gimp.value_set_int32_array,
+                           buffer_format='i')
         self._did_create_gvalue = True
         self._did_convert = True
 
@@ -483,11 +487,13 @@ class FuGenericValue():
 
 
     def to_file_descriptor(self):
-        """ try convert self.actual_arg from string to Gio.File """
-        assert isinstance(self._actual_arg, str)
+        """ try convert self.actual_arg from string (or os.PathLike e.g. pathlib.Path) to Gio.File """
+        assert FuFileCache.is_path(self._actual_arg)
 
+        gfile = None
         try:
-            gfile =  Gio.file_new_for_path(self._actual_arg)
+            # cached, the same path is often passed many times
+            gfile =  FuFileCache.gfile_for(self._actual_arg)
         except Exception as err:
             proceed(f"Failed  Gio.file_new_for_path: {self._actual_arg}.")
         if gfile is None:
@@ -503,6 +509,14 @@ class FuGenericValue():
             self._did_convert = True
 
 
+    def accept_file_descriptor(self):
+        """ Accept self.actual_arg, already a Gio.File, as type Gio.File """
+        self._result_arg = self._actual_arg
+        # Not the type of the instance e.g. GLocalFile
+        self._result_arg_type = Gio.File
+        self._did_convert = True
+
+
     def to_color(self):
         ''' Try convert self.actual_arg to type Gimp.RGB '''
         assert self._did_upcast
@@ -550,10 +564,12 @@ class FuGenericValue():
 
 
 
-    def tryConversionsAndUpcasts(self, formalArgType):
+    def tryConversionsAndUpcasts(self, formalArgType, formalValueType=None):
         '''
         Try convert or upcast self to formalArgType.
 
+        formalValueType is the value_type of the formal GParamSpec, if known, for upcasts.
+
         Any upcast or conversion is the sole upcast or conversion (return early.)
         But an upcast may also internally convert.
         We don't upcast and also convert in this list.
@@ -565,7 +581,7 @@ class FuGenericValue():
         I.E. invert this logic.
         '''
 
-        Upcast.try_gimp_upcasts(formalArgType, self)
+        Upcast.try_gimp_upcasts(formalArgType, self, formalValueType)
         if self.did_coerce:
             return
 
@@ -579,7 +595,7 @@ class FuGenericValue():
         if self.did_coerce:
             return
 
-        Types.try_file_descriptor_conversion(formalArgType, self)
+        Types.try_file_descriptor_conversion(formalArgType, self, formalValueType)
 
         # !!! We don't upcast deprecated constant TRUE to G_TYPE_BOOLEAN
 
@@ -8,6 +8,7 @@ from gi.repository import Gimp
 from gimpfu.adapters.rgb import GimpfuRGB
 from gimpfu.message.proceed import proceed
 from gimpfu.adaption.formal_types import FormalTypes
+from gimpfu.adaption.buffer import FuBuffer
 
 from collections.abc import Sequence    # ABC for sequences
 import logging
@@ -109,9 +110,10 @@ class FuGenericValueArray():
         Return sequence from actual_arg.
 
         actual_arg might already be a list, possibly empty.
+        Or a numpy.ndarray, whose items are its rows.
         Else contain actual_arg in a non-empty list.
         """
-        if FuGenericValueArray.is_tuple_or_list(actual_arg):
+        if FuGenericValueArray.is_tuple_or_list(actual_arg) or FuBuffer.is_ndarray(actual_arg):
             # already a list
             result = actual_arg
             # could be empty list
@@ -121,7 +123,7 @@ class FuGenericValueArray():
             assert(len(result)>0)
 
         # items in list might still be wrapped
-        assert isinstance(result, Sequence)
+        assert isinstance(result, Sequence) or FuBuffer.is_ndarray(result)
         return result
 
 
@@ -159,7 +161,8 @@ class FuGenericValueArray():
     That might be the only way, or maybe is a simpler implementation.
     """
     @classmethod
-    def to_gimp_array(cls, actual_arg, to_container_gtype, gvalue_setter, is_setter_take_contained_type=False ):
+    def to_gimp_array(cls, actual_arg, to_container_gtype, gvalue_setter, is_setter_take_contained_type=False,
+                      buffer_format=None ):
         """
         Return GValue holding a Gimp<foo>Array
         where <foo> is determined by to_container_gtype,
@@ -173,6 +176,10 @@ class FuGenericValueArray():
         gvalue_setter is a method of Gimp e.g. Gimp.value_set_object_array.
 
         One setter (Gimp.value_set_object_array) has extra arg: contained_gtype.
+
+        buffer_format is the struct format of items of the array e.g. 'd',
+        when the array can be set from a buffer (see FuBuffer), else None.
+        Then actual_arg can also be e.g. numpy.ndarray or array.array.
         """
         cls.logger.info(f"to_gimp_array type: {to_container_gtype}")
         #logger.info(f"to_gimp_array type of type: {type(to_container_gtype)}")
@@ -182,18 +189,21 @@ class FuGenericValueArray():
         #foo =GObject.GType.from_name("GimpObjectArray")
         #logger.info(f"to_gimp_array type of type: {type(foo)}")
 
+        # A buffer of fundamental items: no list, and nothing to martial
+        is_buffer = buffer_format is not None and FuBuffer.is_buffer(actual_arg)
+
         # require a list to create an array
         try:
-            list = FuGenericValueArray.sequence_for_actual_arg(actual_arg)
+            if is_buffer:
+                list = FuBuffer.typed_sequence(actual_arg, buffer_format)
+            else:
+                list = FuGenericValueArray.sequence_for_actual_arg(actual_arg)
         except Exception as err:
             proceed(f"Exception in sequence_for_actual_arg: _actual_arg: {actual_arg}, {err}")
 
         # setter i.e. factory method needs gtype of contained items.
-        # hack
-        # use any GIMP boxed type, setter doesn't actually use it???
-        # TEMP This works but is not general
-        # it works only when testing GimpObjectArray
-        contained_gtype = Gimp.Item.__gtype__
+        # Only GimpObjectArray, computed below from the items.
+        contained_gtype = None
 
         # Create GObject.Value of the given to_container_gtype
         try:
@@ -211,7 +221,14 @@ class FuGenericValueArray():
            ??? unwrapped GObjects (responds to .__gtype__)
            fundamental types
         """
-        list = FuGenericValueArray.martial_list_to_bindable_types(list, to_container_gtype)
+        if is_buffer:
+            pass
+        elif FuGenericValueArray.is_contained_gtype_a_gimp_type(to_container_gtype):
+            # One pass: unwrap, and find the lowest common type of items e.g. Drawable
+            from gimpfu.adaption.marshal import Marshal
+            list, contained_gtype = Marshal.unwrap_object_sequence(list)
+        else:
+            list = FuGenericValueArray.martial_list_to_bindable_types(list, to_container_gtype)
 
         try:
             """
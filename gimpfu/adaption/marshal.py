@@ -2,6 +2,7 @@
 import gi
 gi.require_version("Gimp", "3.0")
 from gi.repository import Gimp
+from gi.repository import GObject
 
 from gimpfu.adaption.wrappable import *
 from gimpfu.adaption.types import Types
@@ -15,10 +16,13 @@ from gimpfu.adapters.channel import GimpfuChannel
 from gimpfu.adapters.vectors import GimpfuVectors
 from gimpfu.adapters.rgb import GimpfuRGB
 from gimpfu.adapters.display import GimpfuDisplay
+from gimpfu.adapters.adapter import Adapter
 
 from gimpfu.message.proceed import proceed
+from gimpfu.logger.logger import FuLogSwitch
 
 import logging
+import weakref
 
 
 class Marshal():
@@ -48,6 +52,7 @@ class Marshal():
 
     # static attribute of singleton class
     logger = logging.getLogger('GimpFu.Marshal')
+    log_switch = FuLogSwitch(logger)
 
     '''
     Gimp breaks out image and drawable from other args.
@@ -96,6 +101,85 @@ class Marshal():
 
 
 
+    """
+    Registry of constructors: Gimp type => wrapper class.
+
+    !!! Keep in correspondence with gimp_type_to_wrapper_type_map in wrappable.py
+    Keyed by type, not name, so wrap() is a dictionary lookup, not an eval().
+
+    Subclasses not in the registry e.g. Gimp.GroupLayer
+    are wrapped by the wrapper class of their nearest ancestor, see _wrapper_class_for().
+    """
+    _wrapper_constructors = {
+        Gimp.Image   : GimpfuImage,
+        Gimp.Layer   : GimpfuLayer,
+        Gimp.Channel : GimpfuChannel,
+        Gimp.Display : GimpfuDisplay,
+        Gimp.Vectors : GimpfuVectors,
+        Gimp.RGB     : GimpfuRGB,
+    }
+
+    """
+    Cache of wrappers: (wrapper class, id of adaptee) => wrapper.
+
+    So that the same Gimp object always wraps to the same wrapper,
+    as long as something refers to the wrapper.
+    Weak: the cache does not keep a wrapper alive.
+
+    Only for adaptees having an id stable for the session (Image, Item, Display.)
+    Not for RGB, a mutable value without an id.
+    Gimp does not reuse the id of a deleted image or item.
+    """
+    _wrappers = weakref.WeakValueDictionary()
+
+    # Cache: Gimp type => wrapper class or None.  Includes subclasses, see _wrapper_class_for()
+    _wrapper_classes = dict(_wrapper_constructors)
+
+
+    @staticmethod
+    def _wrapper_class_for(gimp_type):
+        '''
+        Return wrapper class for gimp_type, or None when not wrappable.
+
+        For a subclass of a registered Gimp type, the wrapper class of its nearest ancestor.
+        E.G. Gimp.GroupLayer => GimpfuLayer, Gimp.LayerMask => GimpfuChannel
+        For GI classes, the Python MRO follows the GType hierarchy.
+        '''
+        try:
+            return Marshal._wrapper_classes[gimp_type]
+        except KeyError:
+            pass
+        result = None
+        for klass in gimp_type.__mro__:
+            result = Marshal._wrapper_constructors.get(klass)
+            if result is not None:
+                break
+        Marshal._wrapper_classes[gimp_type] = result
+        return result
+
+
+    @staticmethod
+    def _wrapper_key(wrapper_class, gimp_instance):
+        ''' Return key into _wrappers for gimp_instance, or None when not cacheable. '''
+        get_id = getattr(gimp_instance, 'get_id', None)
+        if get_id is None:
+            return None
+        return (wrapper_class, get_id())
+
+
+    @staticmethod
+    def remember_wrapper(wrapper):
+        '''
+        Cache wrapper, so later wraps of its adaptee return it.
+
+        Called whenever a wrapper is created,
+        including when created by an Author e.g. gimp.Layer(...)
+        '''
+        key = Marshal._wrapper_key(type(wrapper), wrapper.unwrap())
+        if key is not None:
+            Marshal._wrappers[key] = wrapper
+
+
     @staticmethod
     def wrap(gimp_instance):
         '''
@@ -104,6 +188,9 @@ class Marshal():
 
         Requires gimp_instance is-a Gimp object that should be wrapped,
         else exception.
+
+        Returns the same wrapper for the same Gimp object,
+        while that wrapper is alive.
         '''
         '''
         Invoke the internal constructor for wrapper class.
@@ -111,20 +198,25 @@ class Marshal():
         the Nones mean we don't know attributes of adaptee,
         but the adaptee has and knows its attributes.
         '''
-        Marshal.logger.info(f"Wrap: {gimp_instance}")
+        if Marshal.log_switch.info:
+            Marshal.logger.info("Wrap: %s", gimp_instance)
         result = None
 
-        wrapper_type_name = wrapper_type_name_for_instance(gimp_instance)
-        if wrapper_type_name is None:
+        wrapper_class = Marshal._wrapper_class_for(type(gimp_instance))
+        if wrapper_class is None:
             proceed(f"GimpFu: can't wrap gimp type {get_type_name(gimp_instance)}")
             return result
 
-        statement =  wrapper_type_name + '(adaptee=gimp_instance)'
+        key = Marshal._wrapper_key(wrapper_class, gimp_instance)
+        if key is not None:
+            result = Marshal._wrappers.get(key)
+            if result is not None:
+                return result
 
-        # e.g. statement  'GimpfuImage(adaptee=gimp_instance)'
-        Marshal.logger.info(f"attempting to eval: {statement}")
         try:
-            result = eval(statement)
+            # e.g. GimpfuImage(adaptee=gimp_instance)
+            # Adapter.__init__ remembers the new wrapper
+            result = wrapper_class(adaptee=gimp_instance)
         except Exception as err:
             """ Exception in Gimpfu code e.g. missing wrapper. """
             proceed(f"Wrapping: {err}")
@@ -157,7 +249,8 @@ class Marshal():
         else:
             # arg is already Gimp type, or a fundamental type
             result_arg = arg
-        Marshal.logger.info(f"unwrapped to: {result_arg}")
+        if Marshal.log_switch.info:
+            Marshal.logger.info("unwrapped to: %s", result_arg)
         return result_arg
 
 
@@ -172,7 +265,8 @@ class Marshal():
             result = Marshal.wrap(instance)
         else:   # fundamental
             result = instance
-        Marshal.logger.info(f"_try_wrap returns: {result}")
+        if Marshal.log_switch.info:
+            Marshal.logger.info("_try_wrap returns: %s", result)
         return result
 
 
@@ -185,7 +279,8 @@ class Marshal():
         Result is iterable list if args is iterable, a non-iterable if args is not iterable.
         Except: strings are iterable but also fundamental.
         '''
-        Marshal.logger.info(f"wrap_adaptee_results: {args}")
+        if Marshal.log_switch.info:
+            Marshal.logger.info("wrap_adaptee_results: %s", args)
         try:
             unused_iterator = iter(args)
         except TypeError:
@@ -195,12 +290,14 @@ class Marshal():
             # iterable, but could be a string
             if isinstance(args, str):
                 # No need to unwrap
-                Marshal.logger.info(f"wrap_adaptee_results returns: a string")
+                if Marshal.log_switch.info:
+                    Marshal.logger.info("wrap_adaptee_results returns: a string")
                 result = args
             else:
                 # is container, return container of unwrapped
                 result = [Marshal._try_wrap(item) for item in args]
-        Marshal.logger.info(f"wrap_adaptee_results returns: {result}")
+        if Marshal.log_switch.info:
+            Marshal.logger.info("wrap_adaptee_results returns: %s", result)
         return result
 
 
@@ -233,7 +330,8 @@ class Marshal():
             if is_gimpfu_wrappable(instance):
                 result.append(Marshal.wrap(instance))
             else:   # fundamental
-                Marshal.logger.info(f"Not wrapped: {instance}")
+                if Marshal.log_switch.info:
+                    Marshal.logger.info("Not wrapped: %s", instance)
                 result.append(instance)
         return result
 
@@ -251,7 +349,8 @@ class Marshal():
             if is_gimpfu_unwrappable(instance):
                 result.append(Marshal.unwrap(instance))
             else:   # fundamental
-                Marshal.logger.info(f"Not unwrapped: {instance}")
+                if Marshal.log_switch.info:
+                    Marshal.logger.info("Not unwrapped: %s", instance)
                 result.append(instance)
         return result
 
@@ -265,25 +364,90 @@ class Marshal():
         Require each item in result is the same type.
         (Usually a Gimp type.)
 
+        !!! Not require each item in args is a GimpFu wrapped type.
+        It could already be an unwrapped type.
+        """
+        result_list, item_types = Marshal._unwrap_sequence_and_types(args)
+        if len(item_types) > 1:
+            proceed(f"Unwrapped sequence is not type homogenous")
+        return result_list
+
+
+    @staticmethod
+    def unwrap_object_sequence(args):
+        """
+        Return tuple (list, contained_gtype)
+        where list is each item in args unwrapped,
+        and contained_gtype is the lowest common GType of the items.
+        E.G. [Layer, Layer] => Gimp.Layer, [Layer, Channel] => Gimp.Drawable
+
+        Used to create GimpObjectArray, whose items are pointers to GObjects.
+        In one pass over args, since arrays can be thousands of layers.
+
         !!! Not require each item in args is a GimpFu wrapped type.
         It could already be an unwrapped type.
 
-        Used to create GimpObjectArray, which are homogenous.
+        When args is empty, contained_gtype is Gimp.Item.
         """
-        Marshal.logger.debug(f"unwrap_homogenous_sequence")
+        result_list, item_types = Marshal._unwrap_sequence_and_types(args)
+
+        contained_gtype = None
+        for item_type in item_types:
+            gtype = getattr(item_type, '__gtype__', None)
+            if gtype is None or not gtype.is_a(GObject.TYPE_OBJECT):
+                proceed(f"Item of type: {item_type.__name__} in array of Gimp objects.")
+                continue
+            contained_gtype = Marshal._common_gtype(contained_gtype, gtype)
+
+        if contained_gtype is None:
+            contained_gtype = Gimp.Item.__gtype__
+        if Marshal.log_switch.info:
+            Marshal.logger.info("unwrap_object_sequence, count: %s contained gtype: %s", len(result_list), contained_gtype.name)
+        return result_list, contained_gtype
+
+
+    @staticmethod
+    def _unwrap_sequence_and_types(args):
+        """ Return tuple (list of items of args unwrapped, set of types of unwrapped items.) One pass. """
         result_list = []
-        contained_type = None
+        append = result_list.append
+        item_types = set()
+        add_type = item_types.add
         for item in args:
             # !!! This permits items already unwrapped
-            new_item = Marshal.unwrap(item)
-            if contained_type is not None:
-                if type(new_item) != contained_type:
-                    proceed(f"Unwrapped sequence is not type homogenous")
-            else:
-                contained_type = type(new_item)
-            result_list.append(Marshal.unwrap(new_item))
+            if isinstance(item, Adapter):
+                item = item.unwrap()
+            append(item)
+            add_type(type(item))
+        return result_list, item_types
 
-        return result_list
+
+    @staticmethod
+    def _common_gtype(gtype, other_gtype):
+        """
+        Return the lowest GType that both gtype and other_gtype are-a.
+        I.E. the lowest common ancestor in the GType hierarchy.
+        gtype None means: no type yet, return other_gtype.
+        """
+        if gtype is None:
+            return other_gtype
+        result = gtype
+        while not other_gtype.is_a(result):
+            result = result.parent
+        return result
+
+
+    @staticmethod
+    def wrap_object_sequence(items):
+        """
+        Return list of items, each wrapped if wrappable.
+        E.G. a GimpObjectArray result of a PDB procedure.
+
+        Same as wrap_adaptee_results on a list, but one pass, without logging per item.
+        """
+        wrap = Marshal.wrap
+        wrapper_class_for = Marshal._wrapper_class_for
+        return [wrap(item) if wrapper_class_for(type(item)) is not None else item for item in items]
 
 
 
@@ -8,10 +8,13 @@ from gimpfu.adaption.wrappable import *
 from gimpfu.adaption.marshal import Marshal
 from gimpfu.adaption.types import Types
 from gimpfu.adaption.generic_value import FuGenericValue
+from gimpfu.adaption.marshal_plan import FuMarshalPlan
+from gimpfu.adaption.value_array import FuValueArray
 
 from gimpfu.gimppdb.gimppdb import GimpPDB
 
 from gimpfu.message.proceed import proceed
+from gimpfu.logger.logger import FuLogSwitch
 
 import logging
 
@@ -27,9 +30,10 @@ class MarshalPDB():
     '''
 
     logger = logging.getLogger("GimpFu.MarshalPDB")
+    log_switch = FuLogSwitch(logger)
 
     @staticmethod
-    def _try_type_conversions(procedure, gen_value, index):
+    def _try_type_conversions(signature, gen_value, index):
         '''
         Attempt type conversions and upcast when passing to Gimp procedures.
         Conversion: changes Python type of fundamental types, i.e. int to float
@@ -46,7 +50,7 @@ class MarshalPDB():
 
         MarshalPDB.logger.debug(f"_try_type_conversions: index {index}" )
 
-        formal_arg_type = procedure.get_formal_argument_type(index)
+        formal_arg_type = signature.get_formal_argument_type(index)
         if formal_arg_type is None:
             # Probably too many actual args.
             proceed(f"Failed to get formal arg type for index: {index}.")
@@ -54,7 +58,10 @@ class MarshalPDB():
 
         MarshalPDB.logger.debug(f"_try_type_conversions: index {index} formal type: {formal_arg_type}" )
 
-        gen_value.tryConversionsAndUpcasts(formal_arg_type);
+        # e.g. <GType GimpDrawable>, for upcasts decided by GType, see FuTypeLattice
+        formal_value_type = signature.get_formal_argument_value_type(index)
+
+        gen_value.tryConversionsAndUpcasts(formal_arg_type, formal_value_type);
 
         if not gen_value.did_coerce:
             MarshalPDB.logger.debug(f"No type coercion: index {index} formal type: {formal_arg_type}" )
@@ -68,6 +75,32 @@ class MarshalPDB():
         return FuGenericValue.new_gvalue( Gimp.RunMode.__gtype__, Gimp.RunMode.NONINTERACTIVE)
 
 
+    """
+    Cache of compiled plans: procedure name => FuMarshalPlan.
+    A plan is valid while its signature is the one cached by GimpPDB.
+    """
+    _plans = {}
+
+    @staticmethod
+    def get_plan(proc_name):
+        """ Return FuMarshalPlan for proc_name, compiling it on first use, or None.
+
+        A plan is recompiled when GimpPDB has a new signature for proc_name
+        (the procedure was registered again.)
+        """
+        # Called procedure knows its formal parameters.
+        # Cached signature, not a round trip to Gimp per call.
+        signature = GimpPDB.get_signature_by_name(proc_name)
+        if signature is None:
+            return None
+
+        plan = MarshalPDB._plans.get(proc_name)
+        if plan is None or plan.signature is not signature:
+            plan = FuMarshalPlan(signature)
+            MarshalPDB._plans[proc_name] = plan
+        return plan
+
+
     @staticmethod
     def marshal_args(proc_name, *args):
         '''
@@ -82,82 +115,57 @@ class MarshalPDB():
         Optionally synthesize (prefix result) with run mode
         GimpFu feature: hide run_mode from calling author
 
-        For each arg:
-        - Unwrap wrapped arguments so result is GObjects (not a GimpFu object)
-        - Upcasts and conversions
-        - check for error "passing func" FunctionInfo
+        Delegates to a plan compiled once per procedure, see FuMarshalPlan.
         '''
+        plan = MarshalPDB.get_plan(proc_name)
+        if plan is None:
+            proceed(f"Unknown PDB procedure: {proc_name}")
+            return None
 
-        result = []
-
-        formal_args_index = 0
+        result = plan.marshal_args(args)
 
-        # Called procedure knows its formal parameters
-        procedure =  GimpPDB.get_procedure_by_name(proc_name)
+        MarshalPDB.logger.debug(f"marshal_args returns: {result}" )
 
         """
-        Check count of formal versus actual args.
-
-        GimpFu allows count actual args to be less by one,
-        if the procedure takes runmode, and then we insert it.
-        But some callers may have passed runmode
-        (did not use the GimpFu shortcut.)
+        result sequence could be empty (normal)
+        or may be short or long, since we may have proceeded past an error.
         """
-        if (len(args) == procedure.formal_arg_count - 1
-           and procedure.takes_runmode_arg) :
-           """
-           Assume the case that run mode is in the formal args, not in passed actual args.
-           Synthesizing runmode might now work, the caller might have made an error
-           and not just using the GimpFu convention of not passing runmode.
-
-           !!! This causes wierd errors if script passes wrong number of parameters.
-           """
-           result.append( MarshalPDB.synthesize_marshalled_run_mode() )
-           # skip to the next formal arg
-           formal_args_index = 1
-        elif len(args) != procedure.formal_arg_count :
-            '''
-            If more actual args than formal_args we can't know the formal type of the excess actual args.
-            If less actual args than formal_args, we could convert the given args,
-            but Gimp would return an error when we call the PDB procedure with too few args.
-            '''
-            proceed(f"Mismatched count of formal versus actual args for {proc_name}")
-
+        return result
 
 
-        for x in args:
-            MarshalPDB.logger.debug(f"marshalling arg value: {x} index: {formal_args_index}" )
-            # to dump more uncomment this
-            # MarshalPDB.logger.debug(f"cumulative marshalled args: {result}" )
+    @staticmethod
+    def marshal_arg(signature, formal_args_index, x):
+        '''
+        Marshal one arg to a PDB procedure, the generic way.
 
-            go_arg, go_arg_type = MarshalPDB._unwrap_to_param(x)
-            # assert are GObject types, i.e. fundamental or Boxed
-            # We may yet convert some fundamental types (tuples) to Boxed (Gimp.RGB)
+        Returns GValue
 
-            gen_value = FuGenericValue(go_arg, go_arg_type)
+        - Unwrap wrapped arguments so result is GObjects (not a GimpFu object)
+        - Upcasts and conversions
+        - check for error "passing func" FunctionInfo
 
-            # One of the main capabilities of GimpFu: accept loose, Pythonic code and do convenient upcasts/conversions
-            try:
-                MarshalPDB._try_type_conversions(procedure, gen_value, formal_args_index)
-            except Exception as err:
-                proceed(f"Exception in _try_type_conversions: {gen_value}, formal_args_index: {formal_args_index}, {err}")
+        The fallback of a FuMarshalPlan, when no specialized converter applies.
+        '''
+        if MarshalPDB.log_switch.debug:
+            MarshalPDB.logger.debug("marshalling arg value: %s index: %s", x, formal_args_index)
 
+        go_arg, go_arg_type = MarshalPDB._unwrap_to_param(x)
+        # assert are GObject types, i.e. fundamental or Boxed
+        # We may yet convert some fundamental types (tuples) to Boxed (Gimp.RGB)
 
-            if is_wrapped_function(go_arg):
-                proceed("Passing function as argument to PDB.")
+        gen_value = FuGenericValue(go_arg, go_arg_type)
 
-            a_gvalue = gen_value.get_gvalue()
-            result.append(a_gvalue)
+        # One of the main capabilities of GimpFu: accept loose, Pythonic code and do convenient upcasts/conversions
+        try:
+            MarshalPDB._try_type_conversions(signature, gen_value, formal_args_index)
+        except Exception as err:
+            proceed(f"Exception in _try_type_conversions: {gen_value}, formal_args_index: {formal_args_index}, {err}")
 
-            formal_args_index += 1
 
-        MarshalPDB.logger.debug(f"marshal_args returns: {result}" )
+        if is_wrapped_function(go_arg):
+            proceed("Passing function as argument to PDB.")
 
-        """
-        result sequence could be empty (normal)
-        or may be short or long, since we may have proceeded past an error.
-        """
-        return result
+        return gen_value.get_gvalue()
 
 
     @staticmethod
@@ -177,8 +185,7 @@ class MarshalPDB():
         # caller should have previously checked that values is not a Gimp.PDBStatusType.FAIL
         if values:
             # Remember, values is-a Gimp.ValueArray, not has Pythonic methods
-            # TODO should be a method of FuValueArray
-            result_list = Types.convert_gimpvaluearray_to_list_of_gvalue(values)
+            result_list = FuValueArray.to_list(values)
 
             # discard status by slicing
             result_list = result_list[1:]
@@ -231,5 +238,6 @@ class MarshalPDB():
         if result_arg is None:
             MarshalPDB.logger.warning(f"_unwrap_to_param returns None, NoneType")
 
-        MarshalPDB.logger.debug(f"_unwrap_to_param returns: {result_arg} of type {result_arg_type}")
+        if MarshalPDB.log_switch.debug:
+            MarshalPDB.logger.debug("_unwrap_to_param returns: %s of type %s", result_arg, result_arg_type)
         return result_arg, result_arg_type
@@ -0,0 +1,396 @@
+import gi
+from gi.repository import GObject
+
+gi.require_version("Gimp", "3.0")
+from gi.repository import Gimp
+from gi.repository import Gio    # Gio.File
+
+from gimpfu.adapters.adapter import Adapter
+from gimpfu.adapters.rgb import GimpfuRGB
+
+from gimpfu.adaption.formal_types import FormalTypes
+from gimpfu.adaption.buffer import FuBuffer
+from gimpfu.adaption.value_array import FuValueArray
+from gimpfu.adaption.file_cache import FuFileCache
+from gimpfu.adaption.generic_value import FuGenericValue
+from gimpfu.adaption.marshal import Marshal
+
+from gimpfu.message.proceed import proceed
+from gimpfu.message.suggest import Suggest
+
+import logging
+
+
+class FuMarshalPlan():
+    '''
+    A compiled plan for marshalling args to, and unmarshalling results from, one PDB procedure.
+
+    Compiled once per signature (see GimpProcedureSignature),
+    then used for every call to the procedure.
+
+    The plan is:
+    - the run mode synthesis decision
+    - one converter per formal argument
+    - one converter per formal return value, or None when the value needs no conversion
+    - whether to unpack a single result
+
+    A converter is a callable: arg => GValue.
+    It is chosen once from the formal type,
+    instead of trying every conversion and upcast on every call
+    (see FuGenericValue.tryConversionsAndUpcasts.)
+
+    A converter is specialized on the Python types of actual args it expects
+    for its formal type.
+    When an actual arg is some other Python type,
+    the converter falls back to the generic path (MarshalPDB.marshal_arg),
+    which does all the conversions, upcasts and error checks.
+    Thus a plan has the same effect as the generic path, only faster.
+    '''
+
+    logger = logging.getLogger("GimpFu.FuMarshalPlan")
+
+    def __init__(self, signature):
+        # avoid circular import, MarshalPDB imports this module
+        from gimpfu.adaption.marshal_pdb import MarshalPDB
+
+        self.signature = signature
+
+        self._generic_converter = MarshalPDB.marshal_arg
+        self._synthesize_run_mode = MarshalPDB.synthesize_marshalled_run_mode
+        self._generic_unmarshaller = MarshalPDB.unmarshal_results
+
+        self._converters = tuple(
+            self._compile_converter(index) for index in range(signature.formal_arg_count))
+
+        self._result_converters = tuple(
+            FuMarshalPlan._compile_result_converter(type_name, value_type)
+            for type_name, value_type in zip(signature.return_type_names, signature.return_value_types))
+        # TODO is this always the correct thing to do?  See MarshalPDB.unmarshal_results
+        self._is_single_result = (len(self._result_converters) == 1)
+
+        # Run mode synthesis decision.
+        # Count of actual args that means: Author omitted run mode, GimpFu synthesizes it.
+        if signature.takes_runmode_arg:
+            self._runmode_omitted_arg_count = signature.formal_arg_count - 1
+        else:
+            self._runmode_omitted_arg_count = None
+
+        FuMarshalPlan.logger.debug(f"Compiled plan for: {signature.name}")
+
+
+    def marshal_args(self, args):
+        '''
+        Marshal args (a sequence of wrapped or primitive args) according to the plan.
+
+        Returns list of GValue.
+        Like the generic path, can be short or long if we proceed past an error.
+        '''
+        if len(args) == self._runmode_omitted_arg_count:
+            """
+            Assume the case that run mode is in the formal args, not in passed actual args.
+            See MarshalPDB.
+            """
+            result = [self._synthesize_run_mode()]
+            converters = self._converters[1:]
+        else:
+            if len(args) != self.signature.formal_arg_count :
+                proceed(f"Mismatched count of formal versus actual args for {self.signature.name}")
+            result = []
+            converters = self._converters
+
+        result.extend(convert(x) for convert, x in zip(converters, args))
+
+        # Excess actual args, no formal type, generic path will proceed
+        excess_index = len(converters)
+        for x in args[excess_index:]:
+            formal_args_index = len(result)
+            result.append(self._generic_converter(self.signature, formal_args_index, x))
+
+        return result
+
+
+
+    def unmarshal_results(self, values):
+        '''
+        Convert values (a Gimp.ValueArray, result of a PDB call) to Python objects, in one pass.
+
+        Element 0 is the PDB status, discarded.
+        Caller should have previously checked the status is SUCCESS.
+
+        Returns a list, or the single result, or empty list.
+        Falls back to the generic path when values don't match the signature.
+        '''
+        result_converters = self._result_converters
+        if values.length() != len(result_converters) + 1:
+            FuMarshalPlan.logger.warning(f"Count of results not match signature of: {self.signature.name}")
+            return self._generic_unmarshaller(values)
+
+        try:
+            # skip status
+            items = FuValueArray.to_list(values)[1:]
+            result = [item if convert is None else convert(item)
+                      for convert, item in zip(result_converters, items)]
+        except Exception as err:
+            # Probably a bug in Gimp, the generic path fixes up and proceeds
+            FuMarshalPlan.logger.warning(f"Fail unmarshal results of: {self.signature.name}, {err}")
+            return self._generic_unmarshaller(values)
+
+        if self._is_single_result:
+            result = result[0]
+        return result
+
+
+
+    '''
+    Compiling converters.
+
+    Each _*_converter method returns a converter for a formal type,
+    given a dictionary: Python type of actual arg => specialized function.
+    '''
+
+    def _compile_converter(self, index):
+        ''' Return converter for formal arg at index. '''
+        signature = self.signature
+        type_name = signature.argument_type_names[index]
+        value_type = signature.argument_value_types[index]
+
+        def generic(arg):
+            return self._generic_converter(signature, index, arg)
+
+        specializations = FuMarshalPlan._specializations_for(type_name, value_type)
+
+        if specializations is None:
+            if FormalTypes.is_file_value_type(value_type):
+                # before objects: GFile is an interface
+                result = FuMarshalPlan._file_converter(value_type, generic)
+            # Gimp objects, can't be keyed by Python type
+            elif FuMarshalPlan._is_object_value_type(value_type):
+                result = FuMarshalPlan._object_converter(value_type, generic)
+            else:
+                # e.g. enums, GFile, other rare types
+                result = generic
+        else:
+            result = FuMarshalPlan._specialized_converter(specializations, generic)
+        return result
+
+
+    @staticmethod
+    def _specialized_converter(specializations, generic):
+        ''' Return converter that dispatches on exact Python type of actual arg. '''
+        def converter(arg):
+            specialized = specializations.get(type(arg))
+            if specialized is None:
+                return generic(arg)
+            return specialized(arg)
+        return converter
+
+
+    @staticmethod
+    def _object_converter(value_type, generic):
+        '''
+        Return converter for formal arg whose value_type is a Gimp object type.
+
+        Fast path when actual arg (after unwrapping) is-a value_type:
+        the GValue is labeled with value_type, i.e. upcast, e.g. Layer to Drawable.
+        Else generic path, e.g. None or -1 for an optional drawable, or an error.
+        '''
+        def converter(arg):
+            unwrapped = arg.unwrap() if isinstance(arg, Adapter) else arg
+            if isinstance(unwrapped, GObject.Object) and unwrapped.__gtype__.is_a(value_type):
+                return FuGenericValue.new_gvalue(value_type, unwrapped)
+            return generic(arg)
+        return converter
+
+
+    @staticmethod
+    def _file_converter(value_type, generic):
+        '''
+        Return converter for formal arg whose value_type is GFile.
+
+        Fast path for a path (str or pathlib.Path), via a cache of Gio.File,
+        and for a Gio.File, passed unconverted.
+        Else generic path, which proceeds.
+        '''
+        def converter(arg):
+            if FuFileCache.is_path(arg):
+                gfile = FuFileCache.gfile_for(arg)
+                if gfile is not None:
+                    return FuGenericValue.new_gvalue(value_type, gfile)
+            elif isinstance(arg, Gio.File):
+                return FuGenericValue.new_gvalue(value_type, arg)
+            return generic(arg)
+        return converter
+
+
+    @staticmethod
+    def _is_object_value_type(value_type):
+        return value_type.fundamental in (GObject.TYPE_OBJECT, GObject.TYPE_INTERFACE)
+
+
+
+    '''
+    Specializations, by formal type.
+
+    Same effect as Types.try_usual_python_conversion, Upcast.try_to_color,
+    and Types.try_array_conversions, for the actual types they handle.
+    '''
+
+    @staticmethod
+    def _specializations_for(type_name, value_type):
+        '''
+        Return dictionary of specialized functions for formal type_name,
+        or None when formal type is not specialized by Python type.
+        '''
+        new_gvalue = FuGenericValue.new_gvalue
+
+        if FormalTypes.is_int_type(type_name):
+            result = {
+                int   : lambda arg: new_gvalue(int, arg),
+                float : lambda arg: FuMarshalPlan._convert(arg, int),
+                }
+        elif FormalTypes.is_float_type(type_name):
+            result = {
+                float : lambda arg: new_gvalue(float, arg),
+                int   : lambda arg: FuMarshalPlan._convert(arg, float),
+                }
+        elif FormalTypes.is_str_type(type_name):
+            result = {
+                str   : lambda arg: new_gvalue(str, arg),
+                int   : lambda arg: FuMarshalPlan._convert(arg, str),
+                float : lambda arg: FuMarshalPlan._convert(arg, str),
+                }
+        elif FormalTypes.is_boolean_type(type_name):
+            result = {
+                bool  : lambda arg: new_gvalue(bool, arg),
+                int   : lambda arg: new_gvalue(GObject.TYPE_BOOLEAN, arg),
+                }
+        elif FormalTypes.is_unsigned_int_type(type_name):
+            result = { int : lambda arg: new_gvalue(GObject.TYPE_UINT, arg), }
+        elif FormalTypes.is_unsigned_char_type(type_name):
+            result = { int : lambda arg: new_gvalue(GObject.TYPE_UCHAR, arg), }
+        elif type_name == 'GimpParamRGB':
+            result = {
+                Gimp.RGB  : lambda arg: new_gvalue(Gimp.RGB, arg),
+                GimpfuRGB : lambda arg: new_gvalue(Gimp.RGB, arg.unwrap()),
+                tuple     : FuMarshalPlan._to_color,
+                str       : FuMarshalPlan._to_color,
+                }
+        else:
+            array_converter = FuMarshalPlan._array_converter_for(type_name)
+            if array_converter is None:
+                result = None
+            else:
+                # Author can pass a single item where an array is expected, generic path handles that
+                result = {
+                    list  : array_converter,
+                    tuple : array_converter,
+                    }
+                if FuMarshalPlan._is_buffer_array_type(type_name):
+                    # e.g. numpy.ndarray, array.array, see FuBuffer
+                    for buffer_type in FuBuffer.buffer_types:
+                        result[buffer_type] = array_converter
+                elif FormalTypes.is_color_array_type(type_name):
+                    # rows are colors, see GimpfuRGB.colors_from_list_of_python_type
+                    for ndarray_type in FuBuffer.ndarray_types:
+                        result[ndarray_type] = array_converter
+        return result
+
+
+    @staticmethod
+    def _is_buffer_array_type(type_name):
+        ''' Can an array of type_name be set from a buffer?  See FuGenericValue.to_float_array. '''
+        return (FormalTypes.is_float_array_type(type_name)
+             or FormalTypes.is_uint8_array_type(type_name)
+             or FormalTypes.is_int32_array_type(type_name)
+             )
+
+
+    @staticmethod
+    def _array_converter_for(type_name):
+        ''' Return function converting a sequence to a GValue holding array of type_name, or None. '''
+        if FormalTypes.is_float_array_type(type_name):
+            method = FuGenericValue.to_float_array
+        elif FormalTypes.is_object_array_type(type_name):
+            method = FuGenericValue.to_object_array
+        elif FormalTypes.is_string_array_type(type_name):
+            method = FuGenericValue.to_string_array
+        elif FormalTypes.is_uint8_array_type(type_name):
+            method = FuGenericValue.to_uint8_array
+        elif FormalTypes.is_int32_array_type(type_name):
+            method = FuGenericValue.to_int32_array
+        elif FormalTypes.is_color_array_type(type_name):
+            method = FuGenericValue.to_color_array
+        else:
+            return None
+
+        def array_converter(arg):
+            gen_value = FuGenericValue(arg, type(arg))
+            method(gen_value)
+            return gen_value.get_gvalue()
+        return array_converter
+
+
+    @staticmethod
+    def _convert(arg, type_converter):
+        ''' Return GValue of arg converted by type_converter e.g. int to float. '''
+        # Same suggestion as FuGenericValue.convert()
+        Suggest.say(f"converted {type(arg).__name__} to {type_converter.__name__}.")
+        return FuGenericValue.new_gvalue(type_converter, type_converter(arg))
+
+
+    @staticmethod
+    def _to_color(arg):
+        ''' Return GValue holding Gimp.RGB converted from a tuple or str. '''
+        gen_value = FuGenericValue(arg, type(arg))
+        gen_value.upcast(Gimp.RGB)
+        try:
+            gen_value.to_color()
+        except Exception as err:
+            proceed(f"Converting to color: {err}")
+        return gen_value.get_gvalue()
+
+
+
+    '''
+    Compiling result converters.
+
+    Decided from the formal return type:
+    which results are wrapped, which are arrays of wrapped, and which pass through.
+    '''
+
+    @staticmethod
+    def _compile_result_converter(type_name, value_type):
+        ''' Return converter for a result of formal type, or None when result passes through. '''
+        if FuMarshalPlan._is_wrappable_value_type(value_type):
+            # Marshal handles None and unwrappable subclasses
+            result = Marshal._try_wrap
+        elif FormalTypes.is_object_array_type(type_name):
+            result = FuMarshalPlan._wrap_array
+        elif FormalTypes.is_uint8_array_type(type_name):
+            # bytes, see FuBuffer
+            result = lambda item: FuBuffer.from_array_result(item, 'B')
+        elif FormalTypes.is_int32_array_type(type_name):
+            # memoryview of int32, see FuBuffer
+            result = lambda item: FuBuffer.from_array_result(item, 'i')
+        else:
+            # fundamental types, enums, other arrays of fundamental types
+            result = None
+        return result
+
+
+    @staticmethod
+    def _is_wrappable_value_type(value_type):
+        ''' Is value_type a Gimp type that GimpFu wraps, or a subclass of one? '''
+        return (value_type.is_a(Gimp.Item.__gtype__)
+             or value_type.is_a(Gimp.Image.__gtype__)
+             or value_type.is_a(Gimp.Display.__gtype__)
+             or value_type == Gimp.RGB.__gtype__
+             )
+
+
+    @staticmethod
+    def _wrap_array(item):
+        ''' Wrap each element of item, when PyGObject returned a sequence. '''
+        if isinstance(item, (list, tuple)):
+            return Marshal.wrap_object_sequence(item)
+        return item
@@ -0,0 +1,79 @@
+
+import gi
+from gi.repository import GObject
+
+from gimpfu.logger.logger import FuLogSwitch
+
+import logging
+
+
+
+class FuTypeLattice():
+    '''
+    Knows the GType hierarchy (a lattice, by is-a) for coercion of args to PDB procedures.
+
+    Decides whether an actual arg of one GType can be passed where a formal GType is expected.
+    Uses GType.is_a, so it covers every subclass e.g. of Gimp.Item,
+    including ones GimpFu has no name for (e.g. GroupLayer, TextLayer, LayerMask, Selection)
+    and types added by a future GIMP.
+
+    Decisions are memoized in a table: (actual GType, formal GType) => decision.
+    So after the first call for a pair of types, a decision is a dict lookup.
+
+    Replaces the comparison of type name strings (see wrappable.is_subclass_of_type.)
+
+    A singleton class, no instances.
+    '''
+
+    logger = logging.getLogger("GimpFu.FuTypeLattice")
+    log_switch = FuLogSwitch(logger)
+
+    # Decisions
+    ACCEPT    = 'accept'     # actual is formal, pass unchanged
+    UPCAST    = 'upcast'     # actual is a strict subtype of formal, label the GValue with formal
+    UNRELATED = 'unrelated'  # actual is not-a formal, can't pass
+
+    # (actual GType, formal GType) => decision
+    _decisions = {}
+
+
+    @staticmethod
+    def decide(actual_gtype, formal_gtype):
+        ''' Return decision for passing an arg of actual_gtype as formal_gtype. '''
+        key = (actual_gtype, formal_gtype)
+        try:
+            return FuTypeLattice._decisions[key]
+        except KeyError:
+            pass
+
+        if actual_gtype == formal_gtype:
+            result = FuTypeLattice.ACCEPT
+        elif actual_gtype.is_a(formal_gtype):
+            result = FuTypeLattice.UPCAST
+        else:
+            result = FuTypeLattice.UNRELATED
+        FuTypeLattice._decisions[key] = result
+
+        if FuTypeLattice.log_switch.info:
+            FuTypeLattice.logger.info("decide %s as %s: %s", actual_gtype.name, formal_gtype.name, result)
+        return result
+
+
+    @staticmethod
+    def is_strict_subtype(actual_gtype, formal_gtype):
+        ''' Is actual_gtype a subtype of formal_gtype, but not the same type? '''
+        return FuTypeLattice.decide(actual_gtype, formal_gtype) == FuTypeLattice.UPCAST
+
+
+    @staticmethod
+    def is_object_type(gtype):
+        ''' Is gtype a GObject type (or interface), whose values are instances of classes? '''
+        return gtype.fundamental in (GObject.TYPE_OBJECT, GObject.TYPE_INTERFACE)
+
+
+    @staticmethod
+    def gtype_of_instance(instance):
+        ''' Return GType of instance when it is a GObject, else None. '''
+        if isinstance(instance, GObject.Object):
+            return instance.__gtype__
+        return None
@@ -4,10 +4,14 @@ gi.require_version("Gimp", "3.0")
 from gi.repository import Gimp
 
 from gi.repository import GObject    # GObject type constants
+from gi.repository import Gio        # Gio.File
 
 from gimpfu.adaption.formal_types import FormalTypes
+from gimpfu.adaption.value_array import FuValueArray
+from gimpfu.adaption.file_cache import FuFileCache
 from gimpfu.gimppdb.gimppdb import GimpPDB
 from gimpfu.message.proceed import proceed
+from gimpfu.logger.logger import FuLogSwitch
 
 import logging
 
@@ -38,6 +42,7 @@ class Types():
     # TODO optimize.  Get all the args at once, memoize
 
     logger = logging.getLogger("GimpFu.Types")
+    log_switch = FuLogSwitch(logger)
 
     # not used????
     @staticmethod
@@ -56,28 +61,32 @@ class Types():
 
 
     @staticmethod
-    def try_file_descriptor_conversion(formal_arg_type, gen_value):
+    def try_file_descriptor_conversion(formal_arg_type, gen_value, formal_value_type=None):
         """
         Here we first check that a file descriptor is wanted.
-        Then we check whether we convert a string filename.
+        Then we check whether we convert a string filename (or pathlib.Path.)
         Then we check whether it already is a gtype that is-a file.
+
+        formal_value_type is the value_type of the formal GParamSpec, if known.
+        Then a file descriptor is wanted only when it is-a GFile,
+        else any GParamObject is assumed to want a file.
         """
-        formal_arg_type_name = formal_arg_type.name
-        if FormalTypes.is_file_descriptor_type(formal_arg_type_name):
+        if formal_value_type is not None:
+            is_file_wanted = FormalTypes.is_file_value_type(formal_value_type)
+        else:
+            is_file_wanted = FormalTypes.is_file_descriptor_type(formal_arg_type.name)
+
+        if is_file_wanted:
             # Yes, we need a GFile
-            if isinstance(gen_value.actual_arg, str):
+            actual_arg = gen_value.actual_arg
+            if FuFileCache.is_path(actual_arg):
                 gen_value.to_file_descriptor()
+            elif isinstance(actual_arg, Gio.File):
+                # e.g. a GLocalFile, make a GValue telling the type is GFile
+                gen_value.accept_file_descriptor()
             else:
                 Types.logger.warning(f"GFile needed but str not passed.")
 
-            """
-            TODO:
-            if it already is a GObject of type GLocalFile,
-            we simply need to make a GValue, telling it the type is GFile.
-            We really expect a str, to accept a GLocalFile might be more forgiving.
-            elif gen_value.actual_arg.__gtype__ == GLocalFile
-            """
-
 
 
 
@@ -117,7 +126,8 @@ class Types():
         TODO unsigned 64
         '''
 
-        Types.logger.info(f" try_usual_python_conversion: actual type: {gen_value} formal type: {formal_arg_type}")
+        if Types.log_switch.info:
+            Types.logger.info(" try_usual_python_conversion: actual type: %s formal type: %s", gen_value, formal_arg_type)
         # ("     Formal arg type ", formal_arg_type.name )
         assert formal_arg_type is not None
 
@@ -149,12 +159,14 @@ class Types():
         else:
             # TODO convert str to usual types a la SNOBOL
             # !!! That will require more work, not simple upcasts.
-            Types.logger.info(f"try_usual_python_conversion {gen_value.actual_arg_type}"
-               "is not a usual Python conversion")
+            if Types.log_switch.info:
+                Types.logger.info("try_usual_python_conversion %s is not a usual Python conversion",
+                    gen_value.actual_arg_type)
 
         # ensure result_arg_type == type of actual_arg OR (type(actual_arg) is int AND result_type_arg == float)
         # likewise for value of result_arg
-        Types.logger.info(f"try_usual_python_conversion returns {gen_value}")
+        if Types.log_switch.info:
+            Types.logger.info("try_usual_python_conversion returns %s", gen_value)
 
 
 
@@ -182,7 +194,8 @@ class Types():
                 (instance_type != cast_to_type)
             and FormalTypes.is_formal_type_equal_type(formal_arg_type, cast_to_type)
             )
-        Types.logger.info(f"_should_upcast_or_convert => {result}")
+        if Types.log_switch.info:
+            Types.logger.info("_should_upcast_or_convert => %s", result)
         return result
 
 
@@ -198,10 +211,10 @@ class Types():
 
         Ordered by prevalence in PDB signatures.
         """
-        Types.logger.info(f"try_array_conversions ( {formal_arg_type} )")
         # dispatch on formal_arg_type
         formal_arg_type_name = formal_arg_type.name
-        Types.logger.info(f"try_array_conversions formal type name: {formal_arg_type_name}")
+        if Types.log_switch.info:
+            Types.logger.info("try_array_conversions formal type name: %s", formal_arg_type_name)
         if FormalTypes.is_float_array_type(formal_arg_type_name):
             gen_value.to_float_array()
         elif FormalTypes.is_object_array_type(formal_arg_type_name):
@@ -241,21 +254,10 @@ class Types():
     @staticmethod
     def convert_gimpvaluearray_to_list_of_gvalue(array):
         ''' Convert from type *GimpValueArray*, to *list of GValue*. '''
-
-        list_of_gvalue = []
-        len = array.length()   # !!! not len()
-        Types.logger.info(f"convert_gimpvaluearray_to_list_of_gvalue length: {len}")
-        for i in range(len):
-            try:
-                gvalue = array.index(i)
-            except:
-                from gimpfu.adaption.generic_value import FuGenericValue
-                # Probably a bug in Gimp
-                proceed(f"Fail GimpValueArray.index() at index: {i}.")
-                # Fixup with some arbitrary GValue
-                gvalue = FuGenericValue.new_int_gvalue()
-            # Not convert elements from GValue to Python types
-            list_of_gvalue.append(gvalue)
+        # In bulk, with fixups for elements that fail.  See FuValueArray.
+        list_of_gvalue = FuValueArray.to_list(array)
+        if Types.log_switch.info:
+            Types.logger.info("convert_gimpvaluearray_to_list_of_gvalue length: %s", len(list_of_gvalue))
 
         # ensure is list of elements of type GValue, possibly empty
         return list_of_gvalue
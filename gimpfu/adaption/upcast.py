@@ -4,7 +4,9 @@ gi.require_version("Gimp", "3.0")
 from gi.repository import Gimp
 
 from gimpfu.adaption.wrappable import *    # is_subclass_of_type
+from gimpfu.adaption.type_lattice import FuTypeLattice
 from gimpfu.message.proceed import proceed
+from gimpfu.logger.logger import FuLogSwitch
 
 import logging
 
@@ -22,12 +24,21 @@ class Upcast():
     """
 
     logger = logging.getLogger("GimpFu.Upcast")
+    log_switch = FuLogSwitch(logger)
 
     @staticmethod
-    def try_gimp_upcasts(formal_arg_type, gen_value):
+    def try_gimp_upcasts(formal_arg_type, gen_value, formal_value_type=None):
         """
         Try the upcasts required by Gimp PDB.
+
+        formal_value_type is the value_type of the formal GParamSpec e.g. <GType GimpDrawable>, if known.
+        When it is a GObject type, decide by the GType lattice, for any subclass of any Gimp type.
+        Else by the formal_arg_type, for the few types GimpFu knows by name.
         """
+        if formal_value_type is not None and FuTypeLattice.is_object_type(formal_value_type):
+            Upcast.try_to_object_type(formal_value_type, gen_value)
+            return
+
         Upcast.try_to_drawable(formal_arg_type, gen_value)
         if gen_value.did_coerce:
             return
@@ -54,7 +65,8 @@ class Upcast():
         '''
         # assert type is like Gimp.Drawable, cast_to_type has name like Drawable
 
-        Upcast.logger.info(f"Attempt upcast: {gen_value.actual_arg_type} to : {cast_to_type.__name__}")
+        if Upcast.log_switch.info:
+            Upcast.logger.info("Attempt upcast: %s to : %s", gen_value.actual_arg_type, cast_to_type.__name__)
 
         from gimpfu.adaption.types import Types
 
@@ -80,7 +92,38 @@ class Upcast():
             pass
 
         # assert result_type is-a type (a Gimp type, a GObject type)
-        Upcast.logger.info(f"_try_to_type returns FuGenericValue: {gen_value}")
+        if Upcast.log_switch.info:
+            Upcast.logger.info("_try_to_type returns FuGenericValue: %s", gen_value)
+
+
+    @staticmethod
+    def try_to_object_type(formal_value_type, gen_value):
+        '''
+        Upcast gen_value to formal_value_type, a GObject type, as decided by FuTypeLattice.
+
+        E.G. a GroupLayer to Drawable, a LayerMask to Item.
+        None or -1 (v2 allowed -1 for optional drawables) to None of formal_value_type.
+        '''
+        actual_arg = gen_value.actual_arg
+        actual_gtype = FuTypeLattice.gtype_of_instance(actual_arg)
+        if actual_gtype is not None:
+            decision = FuTypeLattice.decide(actual_gtype, formal_value_type)
+            if decision == FuTypeLattice.UPCAST:
+                gen_value.upcast(formal_value_type)
+            elif decision == FuTypeLattice.UNRELATED:
+                proceed(f"Require type: {formal_value_type.name} , but got {gen_value} not castable.")
+            # else ACCEPT, the actual type is the formal type, no upcast
+        elif actual_arg is None:
+            # Gimp wants GValue( Gimp.Drawable, None), apparently
+            gen_value.upcast(formal_value_type)
+        elif type(actual_arg) is int and actual_arg == -1:
+            # v2 allowed -1 as arg for optional drawables
+            # !!! convert arg given by Author
+            gen_value.upcast_to_None(formal_value_type)
+        # else not a GObject, maybe converted later e.g. str to GFile
+
+        if Upcast.log_switch.info:
+            Upcast.logger.info("try_to_object_type returns FuGenericValue: %s", gen_value)
 
 
     # TODO replace this with data driven single procedure
@@ -4,7 +4,7 @@ import gi
 gi.require_version("Gimp", "3.0")
 from gi.repository import Gimp
 
-from gimpfu.adaption.generic_value import FuGenericValue
+# !!! FuGenericValue imported late: it imports Types, which imports this module
 from gimpfu.message.proceed import proceed
 
 import logging
@@ -42,6 +42,9 @@ class FuValueArray():
 
     In a push operations, the gtype may be from the value,
     or the gtype may be passed (when an upcast occurred previously.)
+
+    - Bulk conversion, GimpValueArray <=> Python list, one call each direction.
+    Shared by the runner, the procedure config, and the PDB adaptor.
     '''
 
     logger = logging.getLogger("GimpFu.FuValueArray")
@@ -74,19 +77,88 @@ class FuValueArray():
     @classmethod
     def get_gvalue_array(cls):
         ''' Return a GimpValueArray for the elements in the singleton instance. '''
-        result = Gimp.ValueArray.new(cls.len())
+        return FuValueArray.from_list(cls._list_gvalues)
+
+
+
+    '''
+    Bulk conversion.
+
+    !!! Gimp.ValueArray.index() returns the value of the GValue (PyGObject unmarshals it),
+    so a list from a GimpValueArray is of Python values, not GValues.
+    '''
+
+    @staticmethod
+    def to_list(value_array):
+        '''
+        Return Python list of the values in value_array, a Gimp.ValueArray.
+
+        Happy path: one comprehension, no exception handling per element.
+        When an element fails (probably a bug in Gimp) redo element by element,
+        fixing up the failed elements and proceeding.
+        '''
+        index = value_array.index
+        try:
+            return [index(i) for i in range(value_array.length())]
+        except Exception:
+            return FuValueArray._to_list_with_fixups(value_array)
+
+
+    @staticmethod
+    def _to_list_with_fixups(value_array):
+        ''' Return list of values in value_array, substituting a GValue for each element that fails. '''
+        from gimpfu.adaption.generic_value import FuGenericValue
+
+        result = []
+        for i in range(value_array.length()):
+            try:
+                value = value_array.index(i)
+            except Exception:
+                proceed(f"Fail GimpValueArray.index() at index: {i}.")
+                # Fixup with some arbitrary GValue
+                value = FuGenericValue.new_int_gvalue()
+            result.append(value)
+        return result
+
 
-        # non-pythonic iteration over ValueArray
-        index = 0
-        for item in cls._list_gvalues:
-            result.insert(index, item)
-            index += 1
+    @staticmethod
+    def from_list(values):
+        '''
+        Return a Gimp.ValueArray of values, a sequence of GValues (or Python values PyGObject converts.)
+
+        Pre-sized, and filled by append, not insert at index.
+        '''
+        result = Gimp.ValueArray.new(len(values))
+        append = result.append
+        for value in values:
+            append(value)
         return result
 
+
+    @staticmethod
+    def replace_prefix(value_array, values):
+        '''
+        Return a Gimp.ValueArray like value_array, but whose first len(values) elements are values.
+
+        GimpValueArray lacks a setter, replacing an element is remove and insert,
+        each shifting the elements after it.
+        (And you can't assign to a GValue: "array.index(i) = value" is a SyntaxError.)
+        When values replace every element, return a new array from values, in one pass.
+        Otherwise replace each element of the prefix of value_array, in place.
+        '''
+        if len(values) == value_array.length():
+            return FuValueArray.from_list(values)
+
+        for index, value in enumerate(values):
+            value_array.remove(index)
+            value_array.insert(index, value)
+        return value_array
+
     # NOT USED ??
     @classmethod
     def _fill_with_nonce(cls, array, length):
         """ Fill the array with don't care GValues. """
+        from gimpfu.adaption.generic_value import FuGenericValue
         for i in range(0, length) :
             # value_array.append(None)    generates TypeError: unknown type (null) later???
             # Although docs say this creates an uninitialized GValue
@@ -1,8 +1,12 @@
 
 
+from gimpfu.adaption.type_lattice import FuTypeLattice
+from gimpfu.logger.logger import FuLogSwitch
+
 import logging
 
 module_logger = logging.getLogger('GimpFu.Wrappable')
+module_log_switch = FuLogSwitch(module_logger)
 
 
 '''
@@ -29,13 +33,16 @@ def get_name_of_type(a_type):
 I.E. to add a wrapper Foo:
  - add Foo.py in adapters/
  - add literals like 'Foo' in three places in this file.
+ - add Gimp.Foo : GimpfuFoo to Marshal._wrapper_constructors
 
  wrap is symmetrical with unwrap.
 
  Drawable, Item, are virtual, an Author cannot create instances,
  only instance of subclasses.
+
+ Subclasses of these types are wrapped by the wrapper of their nearest ancestor in this map,
+ e.g. GroupLayer, TextLayer => GimpfuLayer, LayerMask, Selection => GimpfuChannel
 '''
-# TODO other leaf types, LayerMask etc.
 gimp_type_to_wrapper_type_map = {
     'Image'  : "GimpfuImage",
     'Layer'  : "GimpfuLayer",
@@ -45,19 +52,48 @@ gimp_type_to_wrapper_type_map = {
     'RGB'    : "GimpfuRGB",
 }
 
+
+# Cache: Python type => name of its nearest ancestor (or itself) in gimp_type_to_wrapper_type_map, or None
+_wrapped_ancestor_names = {}
+
+def wrapped_ancestor_name(a_type):
+    """
+    Return name of a_type or its nearest ancestor that is wrappable, or None.
+    E.G. Gimp.GroupLayer => 'Layer'
+
+    For GI classes, the Python MRO follows the GType hierarchy.
+    """
+    try:
+        return _wrapped_ancestor_names[a_type]
+    except KeyError:
+        pass
+    result = None
+    for klass in a_type.__mro__:
+        if klass.__name__ in gimp_type_to_wrapper_type_map:
+            result = klass.__name__
+            break
+    _wrapped_ancestor_names[a_type] = result
+    return result
+
+
 def is_gimpfu_wrappable_name(name):
     result = name in gimp_type_to_wrapper_type_map.keys()
-    module_logger.info(f"is_gimpfu_wrappable_name: {name} returns {result}")
+    if module_log_switch.info:
+        module_logger.info("is_gimpfu_wrappable_name: %s returns %s", name, result)
     return result
 
 def is_gimpfu_unwrappable_name(name):
     result = name in gimp_type_to_wrapper_type_map.values()
-    module_logger.info(f"is_gimpfu_unwrappable_name: {name} returns {result}")
+    if module_log_switch.info:
+        module_logger.info("is_gimpfu_unwrappable_name: %s returns %s", name, result)
     return result
 
 # TODO rename is_instance_gimpfu_wrappable
 def is_gimpfu_wrappable(instance):
-    return is_gimpfu_wrappable_name(get_type_name(instance))
+    result = wrapped_ancestor_name(type(instance)) is not None
+    if module_log_switch.info:
+        module_logger.info("is_gimpfu_wrappable: %s returns %s", get_type_name(instance), result)
+    return result
 def is_gimpfu_unwrappable(instance):
     return is_gimpfu_unwrappable_name(get_type_name(instance))
 
@@ -65,9 +101,10 @@ def wrapper_type_name_for_instance(instance):
     """
     return name of Python type for wrapper (like GimpfuLayer) or None
     """
-    name = get_type_name(instance)
+    name = wrapped_ancestor_name(type(instance))
     result = gimp_type_to_wrapper_type_map[name]
-    module_logger.info(f"wrapper_name_for_instance: {name} returns {result}")
+    if module_log_switch.info:
+        module_logger.info("wrapper_name_for_instance: %s returns %s", name, result)
     return result
 
 
@@ -88,7 +125,6 @@ def is_wrapped_function(instance):
 
 '''
 Taken from "GIMP App Ref Manual>Class Hierarchy"
-Note the names are not prefixed with "Gimp."
 
 Authors cannot instantiate Item or Drawable, only their subclasses.
 Drawable and Item are virtual base classes.
@@ -102,25 +138,10 @@ Drawable and Item are virtual base classes.
            "LayerMask",
            "Selection",
     "Vectors"
-'''
-DrawableTypeNames = (
-    "Layer",
-       "GroupLayer",
-       "TextLayer",
-    "Channel",
-       "LayerMask",
-       "Selection",
-)
 
-ItemTypeNames = (
-    "Drawable",
-    "Vectors"
-)
-
-module_logger.info(f"DrawableTypeNames: {DrawableTypeNames}")
-module_logger.info(f"ItemTypeNames: {ItemTypeNames}")
-
-# ItemTypeNames = DrawableTypeNames + ("Vectors",)
+GimpFu does not keep lists of the names.
+Subclassness of Gimp types is decided by GType.is_a, see FuTypeLattice.
+'''
 
 """
 Test cases:
@@ -165,19 +186,16 @@ def is_subclass_of_type(instance, super_type):
     result = False
     super_type_name = get_name_of_type(super_type)
     instance_type_name = get_type_name(instance)
+    instance_gtype = FuTypeLattice.gtype_of_instance(instance)
     if super_type_name == instance_type_name:
         result = False    # class is NOT subclass of itself
-    elif  super_type_name == 'Drawable':
-        result =  instance_type_name in DrawableTypeNames
-    elif super_type_name == 'Item':
-        result = (instance_type_name in ItemTypeNames or instance_type_name in DrawableTypeNames)
+    elif instance_gtype is not None and hasattr(super_type, '__gtype__'):
+        result = FuTypeLattice.is_strict_subtype(instance_gtype, super_type.__gtype__)
     elif super_type_name == 'RGB':
         result = instance_type_name in ColorTypeNames
     else :
         module_logger.warning(f"is_subclass_of_type, unhandled super_type_name {super_type_name}")
 
-    module_logger.info(f"is_subclass_of_type ( {instance_type_name}, {super_type_name}) returns {result}")
-
-    if result:
-        module_logger.debug(f"is_subclass_of_type ( {instance_type_name}, {super_type_name}) returns {result}")
+    if module_log_switch.info:
+        module_logger.info("is_subclass_of_type ( %s, %s) returns %s", instance_type_name, super_type_name, result)
     return result
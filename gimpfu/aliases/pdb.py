@@ -7,6 +7,7 @@ from gi.repository import GObject    # marshalling
 
 from gimpfu.adaption.marshal_pdb import MarshalPDB
 from gimpfu.adaption.compatibility import pdb_name_map
+from gimpfu.gimppdb.gimppdb import GimpPDB
 
 from gimpfu.message.proceed import proceed
 
@@ -53,8 +54,8 @@ class GimpfuPDB():
     An author's access (on right hand side) of an attribute of this class (instance "pdb")
     is adapted to run a procedure in the PDB.
     Requires all accesses to attributes of pdb are function calls (as opposed to get data member.)
-    Each valid get_attribute() returns an interceptor func.
-    The interceptor func marshalls arguments for a call to PDB.run_procedure()
+    Each valid get_attribute() returns an interceptor, a GimpfuPDBProcedure (a callable.)
+    The interceptor marshalls arguments for a call to PDB.run_procedure()
     and returns result of run_procedure()
 
     ???Some get_attributes ARE attributes on Gimp.PDB e.g. run_procedure().
@@ -83,6 +84,8 @@ class GimpfuPDB():
 
     def __init__(self):
         self.logger = logging.getLogger("GimpFu.GimpfuPDB")
+        # Author's attribute name => GimpfuPDBProcedure
+        self._procedures = {}
 
     def _nothing_adaptor_func(self, *args):
         ''' Do nothing when an unknown PDB procedure is called. '''
@@ -90,90 +93,26 @@ class GimpfuPDB():
         return None
 
 
-    def _adaptor_func(self, *args, **kwargs):
-        """
-        Run a PDB procedure whose name was used like "pdb.name()" e.g. like a method call of pdb object.
-
-        Crux: wrap a call to PDB.run_procedure()
-        Wrapping requires marshalling args from Python types to GObject types.
-        Wrapping also requires inserting run_mode arg (GimpFu hides that from Authors.)
-
-        Args are from Author.  That is, they are external (like i/o, beyond our control).
-        Thus we catch exceptions (and check for other errors) and proceed.
-        """
-
-        self.logger.debug(f"_adaptor_func called, args: {args}")
-
-        if kwargs:
-            proceed(f"PDB procedures do not take keyword args.")
-
-        # !!! avoid infinite recursion
-        proc_name = object.__getattribute__(self, "adapted_proc_name")
-
-        # !!! Must unpack args before passing to _marshall_args
-        try:
-            marshaled_args = MarshalPDB.marshal_args(proc_name, *args)
-        except Exception as err: # TODO catch only MarshalError ???
-            proceed(f"marshalling args to pdb.{proc_name} {err}")
-            marshaled_args = None
-
-        if marshaled_args is not None:
-            # marshaled_args is-a list of GValues, but it could be an empty list.
-            # PyGObject will marshall the list into a GimpValueArray
-
-            """
-            This is almost always a segfaulted callee plugin,
-            a separate process that crashed and is failing to respond to IPC.
-            We assert and don't try/except/proceed because the error is
-            serious and external to Author's plugin.
-            """
-            inner_result = Gimp.get_pdb().run_procedure( proc_name , marshaled_args)
-            assert inner_result is not None, f"PDB procedure {proc_name} failed to return value array."
-
-            # The first element of result is the PDB status
-            self.logger.debug(f"run_procedure {proc_name}, result is: {inner_result.index(0)}")
-
-            # pdb is stateful for errors, i.e. gets error from last invoke, and resets on next invoke
-            error_str = Gimp.get_pdb().get_last_error()
-            if error_str != 'success':   # ??? GIMP_PDB_SUCCESS
-                """
-                Log the args because it is a common failure: wrong args.
-                We might also log what Author gave (args) before we marshalled them.
-                TODO i.e. { {*args} } ?, but that leaves braces in the output
-                TODO  { {*args} } throws "unhashable type GimpfuImage"
-                """
-                self.logger.warning(f"Args: {marshaled_args}")
-                proceed(f"PDB call fail: {proc_name} Gimp says: {error_str}")
-                result = None
-            else:
-                result = MarshalPDB.unmarshal_results(inner_result)
-        else:
-            result = None
-
-        # This is the simplified view of what we just did, without all the error checks
-        # object.__getattribute__(self, "_marshall_args")(proc_name, *args)
-
-        # Most PDB calls have side_effects on image, but few return values?
-
-        # ensure result is defined and (is-a list OR None)
-
-        # TODO throws for GBoxed, so log the types and not the values
-        self.logger.debug(f"_adaptor_func for: {proc_name}  returns: {result}")
-        return result
-
-
-
 
     # def  __getattribute__(self, name):
     def __getattr__(self, name):
         '''
         Adapts attribute access to become invocation of PDB procedure.
-        Returns an adapter_func
+        Returns a GimpfuPDBProcedure, a callable bound to the procedure.
 
         Override of Python special method.
         The more common purpose of such override is to compute the attribute,
         or get it from an adaptee.
+
+        The callable is cached per name:
+        after the first access, an access is a dictionary hit, without IPC to Gimp.
+        The callable carries its own procedure name (no state on self),
+        so it can be called later, after other accesses to pdb.
         '''
+        try:
+            return self._procedures[name]
+        except KeyError:
+            pass
 
         '''
         Require that author previously called main()
@@ -188,14 +127,13 @@ class GimpfuPDB():
             # ??? e.g. run_procedure ???, recursion ???
 
             # Map hyphens, and deprecated names.
-            mangled_proc_name = pdb_name_map[name]
+            # Not counted as a use of a deprecated name: the callable counts its calls.
+            mangled_proc_name, deprecated_name = pdb_name_map.resolve(name)
 
             if Gimp.get_pdb().procedure_exists(mangled_proc_name):
-                self.logger.debug(f"__getattr__ returns callable _adaptor_func for reference to: {mangled_proc_name}")
-                # remember state for soon-to-come call
-                self.adapted_proc_name = mangled_proc_name
-                # return intercept function soon to be called
-                result = object.__getattribute__(self, "_adaptor_func")
+                self.logger.debug(f"__getattr__ returns callable for reference to: {mangled_proc_name}")
+                result = GimpfuPDBProcedure(mangled_proc_name, deprecated_name)
+                self._procedures[name] = result
 
                 # TODO We could redirect deprecated names to new procedure names
                 # if they have same signature
@@ -204,7 +142,8 @@ class GimpfuPDB():
                 # elif name = deprecate_pdb_procedure_name_map()
             else:
                 # Can proceed if we catch the forthcoming call
-                # by returning a do_nothing_intercept_func
+                # by returning a do_nothing_intercept_func.
+                # Not cached: the procedure might be registered later.
                 proceed(f"unknown pdb procedure {mangled_proc_name}")
                 result = object.__getattribute__(self, "_nothing_adaptor_func")
 
@@ -290,3 +229,117 @@ class GimpfuPDB():
             result = None
         return result
     """
+
+
+
+class GimpfuPDBProcedure():
+    '''
+    A PDB procedure, bound to its name.
+    What an Author gets from "pdb.name", and then calls: "pdb.name(args)".
+
+    Crux: wrap a call to PDB.run_procedure()
+    Wrapping requires marshalling args from Python types to GObject types.
+    Wrapping also requires inserting run_mode arg (GimpFu hides that from Authors.)
+
+    Lightweight: knows only its procedure name and its compiled FuMarshalPlan
+    (whose signature is cached by GimpPDB.)
+    And the deprecated name the Author used, if any, to count each call in pdb_name_map.statistics().
+    Not stateful across calls, so re-entrant:
+    a callback or other thread may use pdb between an access and a call.
+    '''
+
+    logger = logging.getLogger("GimpFu.GimpfuPDBProcedure")
+
+    def __init__(self, proc_name, deprecated_name=None):
+        # canonical i.e. hyphenated name
+        self.proc_name = proc_name
+        # hyphenated name the Author used, when deprecated, else None
+        self.deprecated_name = deprecated_name
+        # compiled lazily, on first call
+        self._plan = None
+
+    def __repr__(self):
+        return f"<GimpfuPDBProcedure {self.proc_name}>"
+
+
+    @property
+    def plan(self):
+        ''' The FuMarshalPlan for self, or None if the procedure no longer exists. '''
+        plan = self._plan
+        # Recompile when procedure re-registered, i.e. signature invalidated.
+        if plan is None or plan.signature is not GimpPDB.get_signature_by_name(self.proc_name):
+            plan = MarshalPDB.get_plan(self.proc_name)
+            self._plan = plan
+        return plan
+
+
+    def __call__(self, *args, **kwargs):
+        """
+        Run the PDB procedure.
+
+        Args are from Author.  That is, they are external (like i/o, beyond our control).
+        Thus we catch exceptions (and check for other errors) and proceed.
+        """
+        proc_name = self.proc_name
+        self.logger.debug(f"call {proc_name}, args: {args}")
+
+        if self.deprecated_name is not None:
+            pdb_name_map.count_use(self.deprecated_name)
+
+        if kwargs:
+            proceed(f"PDB procedures do not take keyword args.")
+
+        plan = self.plan
+        if plan is None:
+            proceed(f"Unknown PDB procedure: {proc_name}")
+            return None
+
+        # !!! Must unpack args before passing to _marshall_args
+        try:
+            marshaled_args = plan.marshal_args(args)
+        except Exception as err: # TODO catch only MarshalError ???
+            proceed(f"marshalling args to pdb.{proc_name} {err}")
+            marshaled_args = None
+
+        if marshaled_args is not None:
+            # marshaled_args is-a list of GValues, but it could be an empty list.
+            # PyGObject will marshall the list into a GimpValueArray
+
+            """
+            This is almost always a segfaulted callee plugin,
+            a separate process that crashed and is failing to respond to IPC.
+            We assert and don't try/except/proceed because the error is
+            serious and external to Author's plugin.
+            """
+            inner_result = Gimp.get_pdb().run_procedure( proc_name , marshaled_args)
+            assert inner_result is not None, f"PDB procedure {proc_name} failed to return value array."
+
+            # The first element of result is the PDB status
+            status = inner_result.index(0)
+            self.logger.debug(f"run_procedure {proc_name}, result is: {status}")
+
+            if status != Gimp.PDBStatusType.SUCCESS:
+                # pdb is stateful for errors, i.e. gets error from last invoke, and resets on next invoke
+                # Only ask (IPC) for the message when the call failed.
+                error_str = Gimp.get_pdb().get_last_error()
+                """
+                Log the args because it is a common failure: wrong args.
+                We might also log what Author gave (args) before we marshalled them.
+                TODO i.e. { {*args} } ?, but that leaves braces in the output
+                TODO  { {*args} } throws "unhashable type GimpfuImage"
+                """
+                self.logger.warning(f"Args: {marshaled_args}")
+                proceed(f"PDB call fail: {proc_name} Gimp says: {error_str}")
+                result = None
+            else:
+                result = plan.unmarshal_results(inner_result)
+        else:
+            result = None
+
+        # Most PDB calls have side_effects on image, but few return values?
+
+        # ensure result is defined and (is-a list OR None)
+
+        # TODO throws for GBoxed, so log the types and not the values
+        self.logger.debug(f"call {proc_name}  returns: {result}")
+        return result
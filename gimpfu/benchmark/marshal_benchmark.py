@@ -0,0 +1,155 @@
+
+"""
+Benchmark marshalling throughput with logging off versus the former behaviour.
+
+Logging off is the default (GimpFu logger at WARNING.)
+The hot paths are guarded by FuLogSwitch, so a disabled log call costs one attribute test.
+
+Eager is the former behaviour: the logger is still at WARNING,
+but every hot path log call builds its message (as the former f-strings did, often repr'ing GI objects)
+and the message is then discarded.
+Reproduced by forcing the switches on, and formatting each message before the logger discards it.
+The difference from logging off is what the hoisted guards save.
+
+Logging on sets the GimpFu logger to DEBUG, with a handler that formats
+each record and discards it.  For reference: the cost of actually logging.
+
+Usage:
+    python3 -m gimpfu.benchmark.marshal_benchmark [--count N] [--repeat R]
+"""
+
+import gi
+gi.require_version("Gimp", "3.0")
+from gi.repository import Gimp
+from gi.repository import GObject
+
+from gimpfu.logger.logger import FuLogSwitch
+from gimpfu.adaption.marshal import Marshal
+from gimpfu.adaption.types import Types
+from gimpfu.adaption.generic_value import FuGenericValue
+from gimpfu.adaption.wrappable import is_gimpfu_wrappable
+
+import argparse
+import logging
+import time
+
+
+
+class _FormattingNullHandler(logging.Handler):
+    """ Handler that formats each record, like a real handler, but writes nothing. """
+    def emit(self, record):
+        self.format(record)
+
+
+
+def _workload(count):
+    """ Marshal count times a mix of the values an Author typically passes. """
+    formal_float_type = GObject.type_from_name('GParamDouble')
+    sequence = [1, 2.0, "foo"]
+    color = Gimp.RGB()
+
+    for i in range(count):
+        Marshal.unwrap(i)
+        Marshal.unwrap_heterogenous_sequence(sequence)
+        Marshal.wrap_adaptee_results(sequence)
+        is_gimpfu_wrappable(i)
+        Marshal.wrap(color)
+
+        # int to float, as for a PDB arg
+        gen_value = FuGenericValue(i, int)
+        Types.try_usual_python_conversion(formal_float_type, gen_value)
+
+
+
+def _time_workload(count, repeat):
+    """ Return best time in seconds of repeat runs of workload. """
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        _workload(count)
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
+
+
+
+def _set_logging(is_on, handler):
+    """ Turn all GimpFu logging on or off, and refresh the hoisted switches. """
+    logger = logging.getLogger('GimpFu')
+    if is_on:
+        logger.setLevel(logging.DEBUG)
+        logger.addHandler(handler)
+    else:
+        logger.setLevel(logging.WARNING)
+        logger.removeHandler(handler)
+    # Records must not reach handlers of the root logger
+    logger.propagate = False
+    FuLogSwitch.refresh_all()
+
+
+
+def _eager_formatter(log_method):
+    """ Return log method that formats its message first, like an f-string, then calls log_method. """
+    def eager(msg, *args, **kwargs):
+        if args:
+            msg = msg % args
+        return log_method(msg, **kwargs)
+    return eager
+
+
+def _set_eager_formatting(is_eager):
+    """
+    Force the hoisted switches on, and format messages eagerly, while levels are unchanged.
+    Else restore the switches.
+    """
+    for switch in FuLogSwitch._switches:
+        logger = switch.logger
+        if is_eager:
+            switch.debug = True
+            switch.info = True
+            # instance attributes shadow the methods of the Logger class
+            logger.debug = _eager_formatter(logging.Logger.debug.__get__(logger))
+            logger.info = _eager_formatter(logging.Logger.info.__get__(logger))
+        else:
+            logger.__dict__.pop('debug', None)
+            logger.__dict__.pop('info', None)
+    if not is_eager:
+        FuLogSwitch.refresh_all()
+
+
+
+def run(count=10000, repeat=5):
+    """ Run the benchmark, print and return (seconds logging off, seconds eager, seconds logging on). """
+    handler = _FormattingNullHandler()
+    handler.setFormatter(logging.Formatter('%(name)-23s - %(levelname)s - %(message)s'))
+
+    # warm up caches e.g. of wrappers and of name resolution
+    _set_logging(False, handler)
+    _workload(10)
+
+    off_seconds = _time_workload(count, repeat)
+    _set_eager_formatting(True)
+    try:
+        eager_seconds = _time_workload(count, repeat)
+    finally:
+        _set_eager_formatting(False)
+    _set_logging(True, handler)
+    on_seconds = _time_workload(count, repeat)
+    _set_logging(False, handler)
+
+    print(f"marshal workload, {count} iterations, best of {repeat}")
+    print(f"  logging off:         {off_seconds:.4f} s  {count / off_seconds:12.0f} iterations/s")
+    print(f"  eager, at WARNING:   {eager_seconds:.4f} s  {count / eager_seconds:12.0f} iterations/s")
+    print(f"  logging on, DEBUG:   {on_seconds:.4f} s  {count / on_seconds:12.0f} iterations/s")
+    print(f"  speedup of guards over eager formatting: {eager_seconds / off_seconds:.1f}x")
+    return off_seconds, eager_seconds, on_seconds
+
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Benchmark GimpFu marshalling with logging off versus eager formatting and logging on.")
+    parser.add_argument('--count', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+    run(args.count, args.repeat)
@@ -0,0 +1,107 @@
+"""
+Benchmark conversion between Gimp.ValueArray and Python list,
+bulk (FuValueArray) versus element by element (the former implementation.)
+
+For arrays of 10, 100 and 1000 elements (ints, the most common PDB arg.)
+
+Usage:
+    python3 -m gimpfu.benchmark.value_array_benchmark [--count N] [--repeat R]
+"""
+
+import gi
+gi.require_version("Gimp", "3.0")
+from gi.repository import Gimp
+
+from gimpfu.adaption.value_array import FuValueArray
+
+import argparse
+import time
+
+
+
+SIZES = (10, 100, 1000)
+
+
+
+def _to_list_per_element(value_array):
+    """ Former Types.convert_gimpvaluearray_to_list_of_gvalue: try/except per element. """
+    result = []
+    for i in range(value_array.length()):
+        try:
+            value = value_array.index(i)
+        except:
+            value = None
+        result.append(value)
+    return result
+
+
+def _from_list_per_element(values):
+    """ Former FuValueArray.get_gvalue_array: insert at index. """
+    result = Gimp.ValueArray.new(len(values))
+    index = 0
+    for item in values:
+        result.insert(index, item)
+        index += 1
+    return result
+
+
+def _replace_per_element(value_array, values):
+    """ Former FuProcedureConfig._set_value_at_index, for each setting. """
+    for index, value in enumerate(values):
+        value_array.remove(index)
+        value_array.insert(index, value)
+    return value_array
+
+
+
+def _best_time(function, count, repeat):
+    """ Return best time in seconds of repeat runs of count calls of function. """
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(count):
+            function()
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
+
+
+
+def _cases(size):
+    """ Return list of (name, per element function, bulk function) for arrays of size. """
+    values = list(range(size))
+    value_array = FuValueArray.from_list(values)
+    return [
+        ("to list",   lambda: _to_list_per_element(value_array),
+                      lambda: FuValueArray.to_list(value_array)),
+        ("from list", lambda: _from_list_per_element(values),
+                      lambda: FuValueArray.from_list(values)),
+        ("replace",   lambda: _replace_per_element(FuValueArray.from_list(values), values),
+                      lambda: FuValueArray.replace_prefix(FuValueArray.from_list(values), values)),
+        ]
+
+
+
+def run(count=1000, repeat=5):
+    """ Run the benchmark, print and return dictionary (size, case name) => (seconds per element, seconds bulk). """
+    results = {}
+    print(f"GimpValueArray <=> list, {count} conversions, best of {repeat}")
+    print(f"  {'size':>5} {'case':<10} {'per element':>12} {'bulk':>12} {'speedup':>8}")
+    for size in SIZES:
+        for name, per_element, bulk in _cases(size):
+            per_element_seconds = _best_time(per_element, count, repeat)
+            bulk_seconds = _best_time(bulk, count, repeat)
+            results[(size, name)] = (per_element_seconds, bulk_seconds)
+            print(f"  {size:>5} {name:<10} {per_element_seconds:>11.4f}s {bulk_seconds:>11.4f}s"
+                  f" {per_element_seconds / bulk_seconds:>7.1f}x")
+    return results
+
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Benchmark GimpValueArray <=> list conversion, bulk versus per element.")
+    parser.add_argument('--count', type=int, default=1000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+    run(args.count, args.repeat)
@@ -1,9 +1,9 @@
-
 import gi
 gi.require_version("Gimp", "3.0")
 from gi.repository import Gimp
 
 from gimpfu.gimppdb.gimpprocedure import GimpProcedure
+from gimpfu.gimppdb.signature import GimpProcedureSignature
 
 import logging
 
@@ -21,6 +21,17 @@ class GimpPDB:
 
     logger = logging.getLogger("GimpFu.GimpPDB")
 
+    """
+    Process-wide cache of signatures: procedure name => GimpProcedureSignature.
+
+    Populated once per name, on first call to get_signature_by_name.
+    Signatures of the PDB's permanent procedures never change during a session.
+    Temporary procedures can be re-registered with a different signature;
+    whoever re-registers must call invalidate_signature().
+    Only found procedures are cached: a procedure may be registered later.
+    """
+    _signatures = {}
+
     def get_procedure_by_name(proc_name):
         """ Returns Gimp.Procedure for procname, else None.
 
@@ -33,3 +44,36 @@ class GimpPDB:
             result = GimpProcedure(result)
         GimpPDB.logger.info(f"get_procedure_by_name name: {proc_name}, returns {result}")
         return result
+
+
+    def get_signature_by_name(proc_name):
+        """ Returns GimpProcedureSignature for proc_name, else None.
+
+        Cached: only the first call for a name does IPC with Gimp.
+        """
+        try:
+            return GimpPDB._signatures[proc_name]
+        except KeyError:
+            pass
+
+        procedure = GimpPDB.get_procedure_by_name(proc_name)
+        if procedure is None:
+            result = None
+        else:
+            result = GimpProcedureSignature.from_procedure(procedure)
+            GimpPDB._signatures[proc_name] = result
+        GimpPDB.logger.info(f"get_signature_by_name cached signature for: {proc_name}")
+        return result
+
+
+    def invalidate_signature(proc_name=None):
+        """ Forget cached signature for proc_name, or all signatures when proc_name is None.
+
+        Call when a (temporary) procedure is registered again,
+        possibly with a different signature.
+        """
+        if proc_name is None:
+            GimpPDB._signatures.clear()
+        else:
+            GimpPDB._signatures.pop(proc_name, None)
+        GimpPDB.logger.info(f"invalidate_signature: {proc_name}")
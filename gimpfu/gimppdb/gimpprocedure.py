@@ -28,6 +28,10 @@ class GimpProcedure:
         self._procedure = gimp_procedure
         self.logger = logging.getLogger("GimpFu.GimpProcedure")
 
+        # Memoized results of calls to Gimp, see below
+        self._argument_specs = None
+        self._takes_runmode_arg = None
+
 
     """
     Delegated to the wrapped instance of Gimp.Procedure
@@ -38,7 +42,10 @@ class GimpProcedure:
         """ Returns list of GParamSpec for arguments. """
         # Another implementation: Gimp.get_pdb().run_procedure( proc_name , 'gimp-pdb-get-proc-argument', args)
         # Method of wrapped Gimp.Procedure
-        return self._procedure.get_arguments()
+        # Memoized: the formal arguments of an instance of Gimp.Procedure don't change
+        if self._argument_specs is None:
+            self._argument_specs = self._procedure.get_arguments()
+        return self._argument_specs
 
     @property
     def return_specs(self):
@@ -79,11 +86,11 @@ class GimpProcedure:
     @property
     def takes_runmode_arg(self):
         """ is first argument a "run mode" arg """
-        result = RunMode.does_procedure_take_runmode_arg(self)
-        self.logger.debug(f"_takes_runmode_arg for: {self.name} returns: {result}")
-        return result
-
-    # TODO optimized, cache result from Gimp instead of getting it each call
+        # Memoized, see GimpPDB for a cache that outlives this instance
+        if self._takes_runmode_arg is None:
+            self._takes_runmode_arg = RunMode.does_procedure_take_runmode_arg(self)
+            self.logger.debug(f"_takes_runmode_arg for: {self.name} returns: {self._takes_runmode_arg}")
+        return self._takes_runmode_arg
 
 
     """
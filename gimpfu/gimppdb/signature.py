@@ -0,0 +1,112 @@
+
+from collections import namedtuple
+
+import logging
+
+
+"""
+The fields of a GimpProcedureSignature.
+
+!!! Tuples, not lists, so that a signature is immutable.
+"""
+_signature_fields = (
+    'name',                 # str, canonical (hyphenated) name of the PDB procedure
+    'argument_specs',       # tuple of GParamSpec for arguments
+    'argument_types',       # tuple of GType of each GParamSpec e.g. <GType GimpParamDrawable>
+    'argument_type_names',  # tuple of str, name of each argument_types e.g. 'GimpParamDrawable'
+    'argument_value_types', # tuple of GType, the value_type of each GParamSpec e.g. <GType GimpDrawable>
+    'return_specs',         # tuple of GParamSpec for return values
+    'return_types',
+    'return_type_names',
+    'return_value_types',
+    'takes_runmode_arg',    # bool, first argument is a GimpRunMode
+    'formal_arg_count',     # int, len(argument_specs)
+)
+
+
+class GimpProcedureSignature(namedtuple('GimpProcedureSignature', _signature_fields)):
+    """
+    Immutable record of the formal signature of a PDB procedure.
+
+    A snapshot of what GimpProcedure (a thin wrapper of Gimp.Procedure)
+    would answer, taken once.
+    Answering from a snapshot avoids IPC with Gimp on each call to a PDB procedure.
+
+    Created by GimpPDB, which caches one signature per procedure name.
+    See GimpPDB.invalidate_signature() for when a snapshot becomes stale.
+
+    Indexed accessors match the methods of GimpProcedure,
+    so callers can use either one.
+    """
+
+    __slots__ = ()
+
+    logger = logging.getLogger("GimpFu.GimpProcedureSignature")
+
+    @classmethod
+    def from_procedure(cls, procedure):
+        """ Return a signature introspected from procedure, a GimpProcedure. """
+        # Each access to argument_specs is a call into Gimp, so get them once
+        argument_specs = tuple(procedure.argument_specs)
+        return_specs = tuple(procedure.return_specs)
+
+        argument_types = tuple(spec.__gtype__ for spec in argument_specs)
+        return_types = tuple(spec.__gtype__ for spec in return_specs)
+
+        result = cls(
+            name = procedure.name,
+            argument_specs = argument_specs,
+            argument_types = argument_types,
+            argument_type_names = tuple(gtype.name for gtype in argument_types),
+            argument_value_types = tuple(spec.value_type for spec in argument_specs),
+            return_specs = return_specs,
+            return_types = return_types,
+            return_type_names = tuple(gtype.name for gtype in return_types),
+            return_value_types = tuple(spec.value_type for spec in return_specs),
+            takes_runmode_arg = procedure.takes_runmode_arg,
+            formal_arg_count = len(argument_specs),
+        )
+        cls.logger.debug(f"from_procedure: {result.name} args: {result.argument_type_names}")
+        return result
+
+
+    """
+    Indexed accessors, like those of GimpProcedure.
+
+    Return None when index is out of range (probably too many actual args)
+    and let the caller proceed.
+    """
+
+    def get_formal_argument_spec(self, index):
+        ''' Return GParamSpec of argument at index, or None. '''
+        if 0 <= index < self.formal_arg_count:
+            return self.argument_specs[index]
+        return None
+
+    def get_formal_argument_type(self, index):
+        ''' Return GType of GParamSpec of argument at index e.g. <GType GimpParamDrawable>, or None. '''
+        if 0 <= index < self.formal_arg_count:
+            return self.argument_types[index]
+        return None
+
+    def get_formal_argument_value_type(self, index):
+        ''' Return value_type of argument at index e.g. <GType GimpDrawable>, or None. '''
+        if 0 <= index < self.formal_arg_count:
+            return self.argument_value_types[index]
+        return None
+
+    def get_formal_argument_type_name(self, index):
+        ''' Return name of value_type of argument at index e.g. 'GimpDrawable', or None.  As GimpProcedure. '''
+        if 0 <= index < self.formal_arg_count:
+            return self.argument_value_types[index].name
+        return None
+
+    def get_formal_argument_spec_type_name(self, index):
+        ''' Return name of GType of GParamSpec of argument at index e.g. 'GimpParamDrawable', or None. '''
+        if 0 <= index < self.formal_arg_count:
+            return self.argument_type_names[index]
+        return None
+
+    @property
+    def return_count(self):
+        return len(self.return_specs)
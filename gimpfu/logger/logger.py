@@ -13,8 +13,54 @@ logger = logging.getLogger("GimpFu.MarshalPDB")
 
 See 'Using logging in multiple modules'
 recipe https://docs.python.org/3/howto/logging-cookbook.html#logging-cookbook
+
+Environment variables:
+GIMPFU_DEBUG                 log DEBUG and INFO for all of GimpFu
+GIMPFU_DEBUG_SUBSYSTEMS      comma separated names of sub loggers to log DEBUG and INFO
+                             e.g. "Marshal,Types" enables loggers "GimpFu.Marshal", "GimpFu.Types"
+
+Hot paths (called for every arg or attribute access)
+guard their logging with a FuLogSwitch,
+and use lazy %-style formatting, not f-strings,
+so that when logging is off (the default) a log call costs one attribute test.
 """
 
+
+
+class FuLogSwitch:
+    """
+    Hoisted level checks for one logger.
+
+    Created at module load, next to the logger it checks:
+        logger = logging.getLogger("GimpFu.Marshal")
+        log_switch = FuLogSwitch(logger)
+    Used in a hot path:
+        if log_switch.info:
+            logger.info("unwrapped to: %s", result)
+
+    The checks are refreshed when levels change (see FuLogger), not on each call.
+    """
+
+    __slots__ = ('logger', 'debug', 'info')
+
+    # All switches, to refresh.  Modules are not unloaded, so this does not grow.
+    _switches = []
+
+    def __init__(self, logger):
+        self.logger = logger
+        self.refresh()
+        FuLogSwitch._switches.append(self)
+
+    def refresh(self):
+        self.debug = self.logger.isEnabledFor(logging.DEBUG)
+        self.info = self.logger.isEnabledFor(logging.INFO)
+
+    @classmethod
+    def refresh_all(cls):
+        """ Refresh all switches.  Call after changing the level of any GimpFu logger. """
+        for switch in cls._switches:
+            switch.refresh()
+
 class FuLogger:
 
     @staticmethod
@@ -31,6 +77,8 @@ class FuLogger:
         else:
             logger.setLevel(logging.WARNING)   # Omit DEBUG and INFO
 
+        FuLogger._set_subsystem_levels(os.getenv("GIMPFU_DEBUG_SUBSYSTEMS"))
+
         """
         A logger contains one or more handlers,
         components which serialize e.g. print the logged stream of messages.
@@ -54,4 +102,28 @@ class FuLogger:
         logger.addHandler(ch)
         #logger.addHandler(fh)
 
+        # Levels changed, switches created at import of other modules are stale
+        FuLogSwitch.refresh_all()
         return logger
+
+
+    @staticmethod
+    def _set_subsystem_levels(subsystem_names):
+        """ Set level DEBUG on sub loggers named in subsystem_names, a comma separated str or None. """
+        if not subsystem_names:
+            return
+        for name in subsystem_names.split(','):
+            name = name.strip()
+            if name:
+                logging.getLogger('GimpFu.' + name).setLevel(logging.DEBUG)
+
+
+    @staticmethod
+    def set_subsystem_level(name, level):
+        """
+        Set level of sub logger e.g. ("Marshal", logging.DEBUG) at runtime.
+
+        Unlike logger.setLevel(), also refreshes the hoisted switches.
+        """
+        logging.getLogger('GimpFu.' + name).setLevel(level)
+        FuLogSwitch.refresh_all()
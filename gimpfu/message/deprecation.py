@@ -21,6 +21,9 @@ def warn(message):
 
 
 
+from gimpfu.message.framestack import Framestack
+from gimpfu.message.message_log import FuMessageLog
+
 import logging
 
 
@@ -36,10 +39,11 @@ class Deprecation():
     TODO are the registration-time deprecations summarized at run time
 
     FUTURE set procedure name in state, to be prepended to messages
-    FUTURE print the Author's source.
+
+    Aggregated by (message, author's call site), see FuMessageLog
     '''
 
-    log = []
+    log = FuMessageLog()
 
     logger = logging.getLogger("GimpFu.Deprecation")
 
@@ -47,10 +51,11 @@ class Deprecation():
     def say(cls, message):
         ''' Tell user about a deprecation '''
 
-        Deprecation.log.append(message)
+        is_first = Deprecation.log.add(message, Framestack.get_errant_call_site())
 
-        # Not a warning, just info
-        Deprecation.logger.info(message)
+        # Not a warning, just info.  Repetitions are counted in summary.
+        if is_first:
+            Deprecation.logger.info(message)
 
 
 
@@ -62,8 +67,19 @@ class Deprecation():
             print("=================================")
             print("GimpFu's summary of deprecations.")
             print("=================================")
-            for line in Deprecation.log:
-                print(line)
+            Deprecation.log.print_entries()
+            Deprecation._print_name_uses()
             print("")
             result = True
         return result
+
+
+    @staticmethod
+    def _print_name_uses():
+        ''' Print count of uses of each deprecated name, which the log says only once. '''
+        # Late import, compatibility imports this module
+        from gimpfu.adaption.compatibility import get_name_map_statistics
+
+        for map_name, statistics in get_name_map_statistics().items():
+            for deprecated_name, count in statistics['deprecated'].items():
+                print(f"{map_name} name: {deprecated_name} used {count} times")
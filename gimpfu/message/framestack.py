@@ -1,8 +1,14 @@
 
 import inspect
+import linecache
+import sys
 
 """
 Thin wrapper around the Python "inspect" module.
+
+And cheaper alternatives to it:
+capture a call site as (code object, line number) by walking frames,
+and look up its source line later, only when it is printed.
 """
 
 class Framestack:
@@ -48,6 +54,53 @@ class Framestack:
         return source_text
 
 
+    @staticmethod
+    def _is_gimpfu_source(filename):
+        # Fragile with respect to naming and directory structures, see get_errant_source_code_line
+        return filename.find("gimpfu") > 0
+
+
+    @classmethod
+    def get_errant_call_site(cls):
+        '''
+        Return (code object, line number) of author's call, or None.
+
+        Like get_errant_source_code_line, the first frame from the top
+        whose filename is not a gimpfu source file.
+        But reads no source files: cheap enough to call for every error.
+        See source_line_of_call_site().
+        '''
+        frame = sys._getframe(1)
+        while frame is not None:
+            code = frame.f_code
+            if not cls._is_gimpfu_source(code.co_filename):
+                return (code, frame.f_lineno)
+            frame = frame.f_back
+        return None
+
+
+    @staticmethod
+    def source_line_of_call_site(call_site):
+        ''' Return the text line of author's source code at call_site, from get_errant_call_site(). '''
+        if call_site is None:
+            return "empty framestack"
+        code, lineno = call_site
+        # Empty when the source is not a file e.g. plugin being executed does an eval()
+        source_text = linecache.getline(code.co_filename, lineno)
+        if not source_text:
+            source_text = " unknown context"
+        return source_text
+
+
+    @staticmethod
+    def location_of_call_site(call_site):
+        ''' Return (filename, line number, function name) of call_site, or (None, None, None). '''
+        if call_site is None:
+            return None, None, None
+        code, lineno = call_site
+        return code.co_filename, lineno, code.co_name
+
+
     @classmethod
     def print_trace(cls):
         framestack = inspect.stack(context=2)   # 2 means, save 2 lines of source code
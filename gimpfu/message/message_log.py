@@ -0,0 +1,104 @@
+
+from gimpfu.message.framestack import Framestack
+
+
+class FuMessageLog():
+    '''
+    A log of messages to the Author, aggregated and bounded.
+
+    Aggregated: an entry is keyed by (message, call site)
+    and counts repetitions, instead of storing the message again.
+    E.G. a mistake inside a loop over 5000 layers is one entry with count 5000.
+
+    Bounded: at most max_entries distinct entries,
+    each message at most max_message_length characters.
+    Entries beyond the cap are only counted (see dropped_count.)
+
+    A call site is whatever the caller uses to identify the Author's source,
+    usually (code object, line number) from Framestack.get_errant_call_site(),
+    or None.
+
+    Entries keep the order in which they were first logged.
+
+    Used for proceeds, suggestions, and deprecations.
+    See summary.py for a structured dump of all of them.
+    '''
+
+    def __init__(self, max_entries=1000, max_message_length=1000):
+        self.max_entries = max_entries
+        self.max_message_length = max_message_length
+
+        # (message, call_site) => count
+        self._entries = {}
+        self.dropped_count = 0
+
+
+    def add(self, message, call_site=None):
+        '''
+        Log message from call_site.
+
+        Returns True if this is the first occurrence, i.e. a new entry.
+        '''
+        if len(message) > self.max_message_length:
+            message = message[:self.max_message_length] + '...'
+        key = (message, call_site)
+
+        count = self._entries.get(key)
+        if count is not None:
+            self._entries[key] = count + 1
+            return False
+        if len(self._entries) >= self.max_entries:
+            self.dropped_count += 1
+            return False
+        self._entries[key] = 1
+        return True
+
+
+    def entries(self):
+        ''' Iterate over entries as tuples (message, call_site, count) in order first logged. '''
+        for (message, call_site), count in self._entries.items():
+            yield message, call_site, count
+
+
+    def as_dict(self):
+        '''
+        Return entries as a structure of Python builtin types e.g. to dump as JSON:
+        {'entries': [{'message', 'filename', 'line', 'function', 'count'}, ...], 'dropped_count': int}
+        '''
+        entries = []
+        for message, call_site, count in self.entries():
+            filename, line, function = Framestack.location_of_call_site(call_site)
+            entries.append({
+                'message'  : message,
+                'filename' : filename,
+                'line'     : line,
+                'function' : function,
+                'count'    : count,
+                })
+        return {'entries': entries, 'dropped_count': self.dropped_count}
+
+
+    def print_entries(self, prefix=''):
+        ''' Print entries, with count of repetitions and author's source line, for a summary. '''
+        for message, call_site, count in self.entries():
+            if count > 1:
+                print(f"{prefix}{message}  (repeated {count} times)")
+            else:
+                print(prefix + message)
+            if call_site is not None:
+                print("Plugin author's source:" + Framestack.source_line_of_call_site(call_site))
+        if self.dropped_count:
+            print(f"... and {self.dropped_count} more, not recorded.")
+
+
+    def clear(self):
+        self._entries.clear()
+        self.dropped_count = 0
+
+
+    def __len__(self):
+        ''' Count of distinct entries. '''
+        return len(self._entries)
+
+    def __bool__(self):
+        return bool(self._entries) or self.dropped_count > 0
@@ -1,5 +1,6 @@
 
 from gimpfu.message.framestack import Framestack
+from gimpfu.message.message_log import FuMessageLog
 
 import logging
 import os
@@ -45,11 +46,15 @@ Or porting a v2 plugin.
 FUTURE this behaviour is configurable to raise an exception instead of proceeding.
 '''
 
-# cumulative error messages, possibly many lines per error
-proceedLog = []
+# cumulative error messages, one entry per (message, call site), with a count of repetitions
+proceedLog = FuMessageLog()
 
 module_logger = logging.getLogger('GimpFu.proceed')
 
+# If GIMPFU_NOT_PROCEED defined in env, stop at the first error
+# Read once: proceed() can be called many times, e.g. for an error in a loop
+_is_not_proceed = os.getenv("GIMPFU_NOT_PROCEED") is not None
+
 '''
 When proceed is called,
 framestack is usually a sequence of frameinfo's like this:
@@ -73,21 +78,22 @@ filename                                  code_context               what the co
 def proceed(message):
     """ Proceed past an error (logging the fact.) """
 
-    # Log to logger
-    # level=>error, not critical, since we can proceed to find other possible Author errors
-    module_logger.error(f"Proceed past error: {message}")
+    # Only the call site, source is read when summarized
+    call_site = Framestack.get_errant_call_site()
 
     # Log to cummulative private log
-    proceedLog.append("Error: " + message)
-    source_text = Framestack.get_errant_source_code_line()
-    proceedLog.append("Plugin author's source:" + source_text)
+    is_first = proceedLog.add(message, call_site)
+
+    # Log to logger, once per distinct error, repetitions are counted in summary
+    # level=>error, not critical, since we can proceed to find other possible Author errors
+    if is_first:
+        module_logger.error(f"Proceed past error: {message}")
 
     # For debugging inexplicable calls to proceed(), uncomment this line
     # It will print the stack trace at the exception
     # Framestack.print_trace()
 
-    # If GIMPFU_NOT_PROCEED defined in env, stop at the first error
-    if os.getenv("GIMPFU_NOT_PROCEED") is not None:
+    if _is_not_proceed:
         raise RuntimeError
     # else return and keep evaluating the plugin code
 
@@ -119,8 +125,7 @@ def summarize_proceed_errors():
         print("")
         print("Gimpfu warnings may also appear prior to this in the console.")
         print("===========================")
-        for line in proceedLog:
-            print(line)
+        proceedLog.print_entries(prefix="Error: ")
         print("")
         result = True
     return result
@@ -1,6 +1,9 @@
 
+from gimpfu.message.framestack import Framestack
+from gimpfu.message.message_log import FuMessageLog
 
-suggestLog = []
+# Aggregated by (message, call site), see FuMessageLog
+suggestLog = FuMessageLog()
 
 
 """
@@ -15,9 +18,8 @@ class Suggest:
 
         # Not log to logger
 
-        suggestLog.append(message)
-
-        # TODO need a context
+        # Context is the author's source, looked up only when summarized
+        suggestLog.add(message, Framestack.get_errant_call_site())
 
 
     @staticmethod
@@ -29,8 +31,7 @@ class Suggest:
             print("GimpFu's suggestions.")
             print("Your code might be clearer if you use explicit conversions or literals that denote the type.")
             print("===========================")
-            for line in suggestLog:
-                print(line)
+            suggestLog.print_entries()
             print("")
             result = True
         return result
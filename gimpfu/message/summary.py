@@ -0,0 +1,36 @@
+
+from gimpfu.message.proceed import proceedLog
+from gimpfu.message.suggest import suggestLog
+from gimpfu.message.deprecation import Deprecation
+from gimpfu.adaption.compatibility import get_name_map_statistics, clear_name_map_statistics
+
+
+"""
+Structured summary of all messages to the Author.
+
+For batch drivers that run many plugins or images in one process
+and want to dump the messages once at the end, e.g. as JSON,
+instead of reading the printed summaries.
+"""
+
+def get_message_summary():
+    '''
+    Return dictionary of Python builtin types:
+    {'errors': ..., 'suggestions': ..., 'deprecations': ..., 'names': ...}
+    each as from FuMessageLog.as_dict(),
+    except 'names': uses of deprecated names (and hits of the maps) from get_name_map_statistics()
+    '''
+    return {
+        'errors'       : proceedLog.as_dict(),
+        'suggestions'  : suggestLog.as_dict(),
+        'deprecations' : Deprecation.log.as_dict(),
+        'names'        : get_name_map_statistics(),
+        }
+
+
+def clear_messages():
+    ''' Forget all messages, e.g. between runs of a batch. '''
+    proceedLog.clear()
+    suggestLog.clear()
+    Deprecation.log.clear()
+    clear_name_map_statistics()
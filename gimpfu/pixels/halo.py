@@ -0,0 +1,159 @@
+
+from gimpfu.pixels.pixel_buffer import FuPixelBuffer
+from gimpfu.logger.logger import FuLogSwitch
+
+import logging
+from collections import OrderedDict
+
+# NumPy is optional for GimpFu, but required for pixels
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+
+class FuHaloReader():
+    '''
+    Reads tiles of a drawable with a halo: r extra pixels of context on each side.
+
+    For neighbourhood filters (blur, sharpen, edge detect, morphology)
+    which need pixels beyond the border of a tile, else show seams.
+    A kernel gets a tile of shape (height + 2r, width + 2r, channels)
+    and returns only the core, of shape (height, width, channels).
+
+    Beyond the drawable, the halo is the nearest edge pixel (clamped.)
+    Within the drawable, the halo is the real neighbouring pixels, even outside the area iterated.
+
+    Neighbouring tiles overlap by their halos.
+    Instead of reading overlaps again from GEGL,
+    reads are of blocks on the grid of the tiles, kept in a small cache (LRU),
+    and a tile with halo is assembled from the blocks.
+    The default size of the cache holds the blocks a scan order iteration will use again,
+    so each block is read from GEGL once: about three rows of tiles.
+
+    Reads only, on the calling thread (GI is not thread safe.)
+    '''
+
+    logger = logging.getLogger("GimpFu.FuHaloReader")
+    log_switch = FuLogSwitch(logger)
+
+    def __init__(self, drawable, pixel_format, tile_size, halo, area, max_blocks=None):
+        '''
+        drawable is-a Gimp.Drawable (unwrapped.)
+        tile_size is (width, height), halo is r, area is the rect being iterated.
+        Blocks are aligned to the tiles of area.
+        '''
+        self._buffer = drawable.get_buffer()
+        self._extent = FuPixelBuffer.extent(drawable)
+        self._pixel_format = pixel_format
+        self._tile_size = tile_size
+        self._halo = halo
+        self._origin = area[:2]
+
+        if max_blocks is None:
+            max_blocks = FuHaloReader.default_max_blocks(area, tile_size, halo)
+        self._max_blocks = max_blocks
+        # (column, row) => (rect, array) of block
+        self._blocks = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+
+    def __repr__(self):
+        return f"<FuHaloReader halo: {self._halo} blocks: {len(self._blocks)}/{self._max_blocks} hits: {self.hits} misses: {self.misses}>"
+
+
+    @staticmethod
+    def default_max_blocks(area, tile_size, halo):
+        ''' Return count of blocks used by one row of tiles with halo, and the rows above and below. '''
+        tile_width, tile_height = tile_size
+        # ceiling divisions
+        halo_columns = -(-halo // tile_width)
+        halo_rows = -(-halo // tile_height)
+        columns = -(-area[2] // tile_width) + 2 * halo_columns
+        rows = 1 + 2 * halo_rows
+        return (rows + 1) * columns
+
+
+    def _block(self, column, row):
+        ''' Return (rect, array) of block at column, row of the grid, clipped to the drawable, or None when outside. '''
+        key = (column, row)
+        block = self._blocks.get(key)
+        if block is not None:
+            self._blocks.move_to_end(key)
+            self.hits += 1
+            return block
+
+        tile_width, tile_height = self._tile_size
+        x1 = max(self._origin[0] + column * tile_width, 0)
+        y1 = max(self._origin[1] + row * tile_height, 0)
+        x2 = min(self._origin[0] + (column + 1) * tile_width, self._extent[2])
+        y2 = min(self._origin[1] + (row + 1) * tile_height, self._extent[3])
+        if x2 <= x1 or y2 <= y1:
+            return None
+        rect = (x1, y1, x2 - x1, y2 - y1)
+        # read-only view, it is only copied from
+        block = (rect, FuPixelBuffer.read_rect(self._buffer, rect, self._pixel_format))
+        self.misses += 1
+
+        self._blocks[key] = block
+        if len(self._blocks) > self._max_blocks:
+            self._blocks.popitem(last=False)
+        return block
+
+
+    def read(self, rect):
+        '''
+        Return writable array of shape (height + 2r, width + 2r, channels): rect and its halo.
+        '''
+        x, y, width, height = rect
+        r = self._halo
+        tile_width, tile_height = self._tile_size
+        origin_x, origin_y = self._origin
+
+        # halo rect, clipped to drawable
+        x1 = max(x - r, 0)
+        y1 = max(y - r, 0)
+        x2 = min(x + width + r, self._extent[2])
+        y2 = min(y + height + r, self._extent[3])
+
+        result = numpy.empty((y2 - y1, x2 - x1, self._pixel_format.channels), dtype=self._pixel_format.dtype)
+        for row in range((y1 - origin_y) // tile_height, (y2 - 1 - origin_y) // tile_height + 1):
+            for column in range((x1 - origin_x) // tile_width, (x2 - 1 - origin_x) // tile_width + 1):
+                block = self._block(column, row)
+                if block is None:
+                    continue
+                (block_x, block_y, block_width, block_height), pixels = block
+                # intersection of block and clipped halo rect
+                ix1 = max(block_x, x1)
+                iy1 = max(block_y, y1)
+                ix2 = min(block_x + block_width, x2)
+                iy2 = min(block_y + block_height, y2)
+                if ix2 <= ix1 or iy2 <= iy1:
+                    continue
+                result[iy1 - y1:iy2 - y1, ix1 - x1:ix2 - x1] = \
+                    pixels[iy1 - block_y:iy2 - block_y, ix1 - block_x:ix2 - block_x]
+
+        # clamp beyond the drawable: repeat edge pixels
+        padding = ((y1 - (y - r), (y + height + r) - y2),
+                   (x1 - (x - r), (x + width + r) - x2),
+                   (0, 0))
+        if any(before or after for before, after in padding):
+            result = numpy.pad(result, padding, mode='edge')
+        return result
+
+
+    def finish(self):
+        ''' Release the cache. '''
+        if FuHaloReader.log_switch.info:
+            FuHaloReader.logger.info("finish %s", self)
+        self._blocks.clear()
+
+
+    @staticmethod
+    def core(tile, halo):
+        ''' Return view of the core of tile (with halo), i.e. without the halo. '''
+        if halo == 0:
+            return tile
+        return tile[halo:-halo, halo:-halo]
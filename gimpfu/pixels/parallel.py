@@ -0,0 +1,297 @@
+
+from gimpfu.pixels.pixel_format import FuPixelFormat
+from gimpfu.pixels.pixel_buffer import FuPixelBuffer
+from gimpfu.pixels.tiles import FuTiles
+from gimpfu.pixels.halo import FuHaloReader
+from gimpfu.message.proceed import proceed
+from gimpfu.logger.logger import FuLogSwitch
+
+import logging
+import multiprocessing
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing import shared_memory
+
+# NumPy is optional for GimpFu, but required for pixels
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+
+'''
+Worker side.
+
+Module level, so a worker process can find them.
+A worker attaches once (in the pool initializer) to the shared memory holding the pixels,
+then each task is only the coordinates of a tile: no pixels are pickled.
+'''
+
+# In a worker: (SharedMemory blocks, source array, result array, func, halo)
+_worker_state = None
+
+
+def _attach_worker(source_name, source_shape, result_name, result_shape, dtype_name, func, halo):
+    '''
+    Pool initializer: attach to the shared pixels.
+    Without halo, source and result are the same block.
+    '''
+    global _worker_state
+    dtype = numpy.dtype(dtype_name)
+    source_shm = shared_memory.SharedMemory(name=source_name)
+    source = numpy.ndarray(source_shape, dtype=dtype, buffer=source_shm.buf)
+    if result_name == source_name:
+        blocks = (source_shm,)
+        result = source
+    else:
+        result_shm = shared_memory.SharedMemory(name=result_name)
+        blocks = (source_shm, result_shm)
+        result = numpy.ndarray(result_shape, dtype=dtype, buffer=result_shm.buf)
+    _worker_state = (blocks, source, result, func, halo)
+
+
+def _map_tile(task):
+    '''
+    Apply func to one tile of the shared pixels.
+
+    task is (x, y, width, height) of the core of the tile, relative to the result array.
+    Without halo, func gets a writable view of the tile.
+    It can modify it in place and return None, or return an array of the same shape.
+    With halo, func gets a copy of the tile and its halo
+    (other workers read the same halo), and returns the core.
+    Returns None, or (task, message) when func failed (exceptions don't cross processes well.)
+    '''
+    _, source, result, func, halo = _worker_state
+    x, y, width, height = task
+    tile = source[y:y + height + 2 * halo, x:x + width + 2 * halo]
+    if halo:
+        tile = tile.copy()
+    try:
+        core = func(tile)
+        if core is None:
+            core = FuHaloReader.core(tile, halo)
+        # Not broadcast: a scalar or a wrong shape would spread over the tile
+        shape = getattr(core, 'shape', None)
+        expected = (height, width, source.shape[2])
+        if shape != expected:
+            return (task, f"Result of shape: {shape} is not: {expected} in tile: {task}")
+        if core is not tile:
+            result[y:y + height, x:x + width] = core
+    except Exception as err:
+        return (task, f"{type(err).__name__}: {err} in tile: {task}")
+    return None
+
+
+
+class FuParallel():
+    '''
+    Applies an Author's function to the tiles of a drawable, in parallel.
+
+    Two modes.
+
+    Process mode: a pool of worker processes, for CPU bound pure Python (or NumPy light) functions,
+    which would otherwise run on one core because of the GIL.
+
+    - The pixels of the area are read, tile by tile, into one block of multiprocessing.shared_memory
+    - Workers attach to the block, and apply func to tiles in place.
+      Tasks are tile coordinates, pixel data is not pickled.
+    - The block is written to the shadow buffer tile by tile, merged once (one undo step) and updated.
+
+    func must be picklable, i.e. defined at the top level of a module.
+    Only the plugin process calls Gimp: workers see only NumPy arrays.
+
+    Workers are forked when the platform can fork, so the plugin's module is not imported again.
+    (GimpFu plugins call main() at import.)
+
+    Memory: the shared block holds the whole area.
+    For areas larger than memory, use thread mode or drawable.tiles().
+
+    Thread mode: a pool of threads, for functions that release the GIL,
+    i.e. mostly NumPy (ufuncs, take() through a lookup table, convolutions.)
+    No process start up, no shared memory, and func can be any callable (a lambda, a closure.)
+
+    - The calling thread does all reads and writes of GEGL buffers (all calls through GI), and nothing else.
+    - Threads of the pool only run func, on tiles already read.
+    - Tiles are written back in scan order, whatever order the threads finish in.
+    - At most a few tiles per thread are in flight, so memory is bounded as for drawable.tiles().
+
+    Halo: for neighbourhood filters, func gets r pixels of context around each tile (see FuHaloReader)
+    and returns only the core.
+    In process mode the shared block holds the area and its halo, and results go to a second block.
+    In thread mode tiles with halo are assembled from a cache of blocks.
+
+    A singleton class, no instances.
+    '''
+
+    logger = logging.getLogger("GimpFu.FuParallel")
+    log_switch = FuLogSwitch(logger)
+
+
+    @staticmethod
+    def _context():
+        ''' Return multiprocessing context, fork when available. '''
+        if 'fork' in multiprocessing.get_all_start_methods():
+            return multiprocessing.get_context('fork')
+        return multiprocessing.get_context('spawn')
+
+
+    # Tiles in flight (read, not yet written) per thread in thread mode.
+    # Enough that threads don't wait on the I/O thread, few enough to bound memory.
+    tiles_in_flight_per_worker = 2
+
+
+    @staticmethod
+    def parallel_map(drawable, func, tile_size=256, workers=None, format=None, rect=None, mode='process', halo=0):
+        '''
+        Apply func to each tile of rect of drawable (a Gimp.Drawable), in a pool of workers.
+
+        func(tile) gets a writable array of shape (height, width, channels),
+        and modifies it in place (returning None) or returns an array of the same shape.
+        workers: count of processes or threads, default os.cpu_count()
+        mode: 'process' or 'thread'
+        halo: func gets tiles of shape (height + 2 halo, width + 2 halo, channels), returns the core
+        '''
+        if mode not in ('process', 'thread'):
+            proceed(f"parallel_map mode: {mode} is not 'process' or 'thread'.")
+            return
+        pixel_format = FuPixelFormat.for_drawable(drawable, format)
+        if pixel_format is None:
+            return
+        rect = FuPixelBuffer.clip_rect(drawable, rect)
+        if rect is None:
+            return
+        if isinstance(tile_size, int):
+            tile_size = (tile_size, tile_size)
+        if workers is None:
+            workers = os.cpu_count() or 1
+
+        if FuParallel.log_switch.info:
+            FuParallel.logger.info("parallel_map %s, %s workers, halo: %s, format: %s", mode, workers, halo, pixel_format.name)
+        if mode == 'process':
+            FuParallel._process_map(drawable, func, tile_size, workers, pixel_format, rect, halo)
+        else:
+            FuParallel._thread_map(drawable, func, tile_size, workers, pixel_format, rect, halo)
+
+
+    @staticmethod
+    def _process_map(drawable, func, tile_size, workers, pixel_format, rect, halo):
+        x, y, width, height = rect
+        result_shape = (height, width, pixel_format.channels)
+        source_rect = (x - halo, y - halo, width + 2 * halo, height + 2 * halo)
+        source_shape = (source_rect[3], source_rect[2], pixel_format.channels)
+
+        blocks = []
+        source = result = None
+        try:
+            source_shm = shared_memory.SharedMemory(create=True, size=max(1, pixel_format.bytes_per_pixel * source_rect[2] * source_rect[3]))
+            blocks.append(source_shm)
+            source = numpy.ndarray(source_shape, dtype=pixel_format.dtype, buffer=source_shm.buf)
+            if halo:
+                # Workers read neighbouring halos while others write results, so results go elsewhere
+                result_shm = shared_memory.SharedMemory(create=True, size=max(1, pixel_format.bytes_per_pixel * width * height))
+                blocks.append(result_shm)
+                result = numpy.ndarray(result_shape, dtype=pixel_format.dtype, buffer=result_shm.buf)
+            else:
+                result_shm = source_shm
+                result = source
+
+            # Read tile by tile into the shared block: transient memory is one tile.
+            # Reads clamp beyond the drawable, so the halo at its borders is edge pixels.
+            buffer = drawable.get_buffer()
+            for tile_rect in FuTiles.tile_rects(source_rect, tile_size):
+                tile_x, tile_y, tile_width, tile_height = tile_rect
+                source[tile_y - source_rect[1]:tile_y - source_rect[1] + tile_height,
+                       tile_x - source_rect[0]:tile_x - source_rect[0] + tile_width] = \
+                    FuPixelBuffer.read_rect(buffer, tile_rect, pixel_format)
+            tasks = [(tile_x - x, tile_y - y, tile_width, tile_height)
+                     for tile_x, tile_y, tile_width, tile_height in FuTiles.tile_rects(rect, tile_size)]
+
+            context = FuParallel._context()
+            with context.Pool(workers, _attach_worker,
+                              (source_shm.name, source_shape, result_shm.name, result_shape,
+                               pixel_format.dtype.name, func, halo)) as pool:
+                errors = [error for error in pool.imap_unordered(_map_tile, tasks) if error is not None]
+
+            failed = set()
+            for task, message in errors:
+                proceed(f"parallel_map: {message}")
+                failed.add(task)
+
+            # Write tile by tile, as read: transient memory is one tile.  One merge.
+            shadow = FuPixelBuffer.begin_write(drawable, covered=rect)
+            for task in tasks:
+                tile_x, tile_y, tile_width, tile_height = task
+                tile_rect = (tile_x + x, tile_y + y, tile_width, tile_height)
+                if (task in failed
+                        or not FuPixelBuffer.write_rect(shadow, tile_rect, pixel_format,
+                                                        result[tile_y:tile_y + tile_height, tile_x:tile_x + tile_width])):
+                    # leave the tile unchanged
+                    FuPixelBuffer.restore_rect(drawable, shadow, tile_rect)
+            FuPixelBuffer.finish_write(drawable, shadow, rect)
+        finally:
+            del source, result
+            for block in blocks:
+                # Unlink first: the segment must not outlive us, even if close() fails
+                block.unlink()
+                try:
+                    block.close()
+                except BufferError:
+                    # A view is still exported, e.g. held by the traceback of an exception in flight.
+                    # The mapping is released when the view is.  Don't hide the exception in flight.
+                    pass
+
+
+    @staticmethod
+    def _apply(func, tile, halo):
+        ''' In a thread of the pool: return the result of func on tile, the core of tile when None. '''
+        result = func(tile)
+        return FuHaloReader.core(tile, halo) if result is None else result
+
+
+    @staticmethod
+    def _thread_map(drawable, func, tile_size, workers, pixel_format, rect, halo):
+        '''
+        The calling thread is the I/O thread: it reads a tile, submits it, and writes back finished tiles.
+
+        Futures are kept in submission (scan) order, and only the oldest is waited on,
+        so writes are in scan order.
+        '''
+        if halo:
+            reader = FuHaloReader(drawable, pixel_format, tile_size, halo, rect)
+            read = reader.read
+        else:
+            buffer = drawable.get_buffer()
+            read = lambda tile_rect : FuPixelBuffer.read_rect(buffer, tile_rect, pixel_format, writable=True)
+        # Every tile of rect is written, or restored
+        shadow = FuPixelBuffer.begin_write(drawable, covered=rect)
+        max_in_flight = max(1, workers * FuParallel.tiles_in_flight_per_worker)
+        # (rect, future) in scan order
+        in_flight = deque()
+
+        def write_oldest():
+            tile_rect, future = in_flight.popleft()
+            try:
+                result = future.result()
+            except Exception as err:
+                proceed(f"parallel_map: {type(err).__name__}: {err} in tile: {tile_rect}")
+                result = None
+            if result is None or not FuPixelBuffer.write_rect(shadow, tile_rect, pixel_format, result):
+                # leave the tile unchanged
+                FuPixelBuffer.restore_rect(drawable, shadow, tile_rect)
+
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="GimpFuTile") as pool:
+            for tile_rect in FuTiles.tile_rects(rect, tile_size):
+                if len(in_flight) >= max_in_flight:
+                    write_oldest()
+                tile = read(tile_rect)
+                in_flight.append((tile_rect, pool.submit(FuParallel._apply, func, tile, halo)))
+                del tile
+            while in_flight:
+                write_oldest()
+        if halo:
+            reader.finish()
+
+        # One merge
+        FuPixelBuffer.finish_write(drawable, shadow, rect)
@@ -0,0 +1,253 @@
+
+import gi
+gi.require_version("Gimp", "3.0")
+from gi.repository import Gimp
+gi.require_version("Gegl", "0.4")
+from gi.repository import Gegl
+
+from gimpfu.pixels.pixel_format import FuPixelFormat
+from gimpfu.message.proceed import proceed
+from gimpfu.logger.logger import FuLogSwitch
+
+import logging
+
+
+
+class FuPixelBuffer():
+    '''
+    Reads and writes rectangles of pixels of a drawable, as NumPy arrays.
+
+    Reads are from the drawable's GEGL buffer, one bulk read per rectangle.
+    Writes are to the drawable's shadow buffer.
+    A write is finished by merging the shadow (which makes an undo step)
+    and updating the rectangle (so displays show the change.)
+
+    A rect is a tuple (x, y, width, height) in drawable coordinates,
+    i.e. (0, 0) is the top left of the drawable, not of the image.
+
+    Takes unwrapped drawables (Gimp.Drawable.)
+    Authors use methods of GimpfuDrawable, which delegate here.
+
+    A singleton class, no instances.
+    '''
+
+    logger = logging.getLogger("GimpFu.FuPixelBuffer")
+    log_switch = FuLogSwitch(logger)
+
+
+    @staticmethod
+    def extent(drawable):
+        ''' Return rect of all of drawable. '''
+        return (0, 0, drawable.get_width(), drawable.get_height())
+
+
+    @staticmethod
+    def clip_rect(drawable, rect):
+        '''
+        Return rect clipped to the extent of drawable, or None (after proceed) when the result is empty.
+        rect None means all of drawable.
+        '''
+        if rect is None:
+            return FuPixelBuffer.extent(drawable)
+
+        x, y, width, height = rect
+        x1 = max(x, 0)
+        y1 = max(y, 0)
+        x2 = min(x + width,  drawable.get_width())
+        y2 = min(y + height, drawable.get_height())
+        if x2 <= x1 or y2 <= y1:
+            proceed(f"Rectangle: {rect} does not intersect drawable.")
+            return None
+        return (x1, y1, x2 - x1, y2 - y1)
+
+
+    '''
+    Low level: on GEGL buffers, for the drawable methods and for tiles.
+    '''
+
+    @staticmethod
+    def read_rect(buffer, rect, pixel_format, writable=False):
+        '''
+        Return array of the pixels of rect of buffer (a Gegl.Buffer) in pixel_format.
+
+        One bulk read.  Unless writable, the array is a read-only view of the bytes read, not a copy.
+        Pixels outside the buffer are the nearest pixel inside (clamped.)
+        '''
+        x, y, width, height = rect
+        data = buffer.get(Gegl.Rectangle.new(x, y, width, height), 1.0, pixel_format.name, Gegl.AbyssPolicy.CLAMP)
+        return pixel_format.array_from_bytes(data, width, height, writable)
+
+
+    @staticmethod
+    def write_rect(buffer, rect, pixel_format, array):
+        '''
+        Write array into rect of buffer, converting from pixel_format.
+        array has shape (height, width, channels), or (height, width) when pixel_format has one channel.
+        Return False (after proceed) when not written.
+
+        !!! Check before set: Gegl.Buffer.set reads a whole rect of bytes, whatever the length of the bytes.
+        '''
+        x, y, width, height = rect
+        shape = getattr(array, 'shape', None)
+        if not (shape == (height, width, pixel_format.channels)
+                or (shape == (height, width) and pixel_format.channels == 1)):
+            proceed(f"Shape of array: {shape} does not match rectangle: {rect} of format: {pixel_format.name}.")
+            return False
+        data = pixel_format.bytes_from_array(array)
+        if len(data) != width * height * pixel_format.bytes_per_pixel:
+            proceed(f"Length of pixels: {len(data)} does not match rectangle: {rect} of format: {pixel_format.name}.")
+            return False
+        buffer.set(Gegl.Rectangle.new(x, y, width, height), pixel_format.name, data)
+        return True
+
+
+    @staticmethod
+    def restore_rect(drawable, shadow, rect):
+        ''' Copy rect of drawable into shadow, e.g. when a write of rect failed and begin_write did not copy. '''
+        rectangle = Gegl.Rectangle.new(*rect)
+        drawable.get_buffer().copy(rectangle, Gegl.AbyssPolicy.NONE, shadow, rectangle)
+
+
+    @staticmethod
+    def mask_bounds(drawable):
+        ''' Return rect of the bounds of the selection on drawable (all of it when no selection), or None when they don't intersect. '''
+        is_intersecting, x, y, width, height = drawable.mask_intersect()
+        if not is_intersecting:
+            return None
+        return (x, y, width, height)
+
+
+    @staticmethod
+    def intersect_rect(rect, other):
+        ''' Return intersection of rects, or None when empty. '''
+        x1 = max(rect[0], other[0])
+        y1 = max(rect[1], other[1])
+        x2 = min(rect[0] + rect[2], other[0] + other[2])
+        y2 = min(rect[1] + rect[3], other[1] + other[3])
+        if x2 <= x1 or y2 <= y1:
+            return None
+        return (x1, y1, x2 - x1, y2 - y1)
+
+
+    @staticmethod
+    def subtract_rect(rect, hole):
+        '''
+        Return list of rects covering rect except hole: at most four strips (above, below, left, right.)
+        Empty when hole contains rect.
+        '''
+        x1, y1 = rect[0], rect[1]
+        x2, y2 = x1 + rect[2], y1 + rect[3]
+        hx1 = min(max(hole[0], x1), x2)
+        hy1 = min(max(hole[1], y1), y2)
+        hx2 = max(min(hole[0] + hole[2], x2), hx1)
+        hy2 = max(min(hole[1] + hole[3], y2), hy1)
+        if hx1 == hx2 or hy1 == hy2:
+            # no overlap
+            return [rect]
+        strips = [
+            (x1,  y1,  x2 - x1,  hy1 - y1),
+            (x1,  hy2, x2 - x1,  y2 - hy2),
+            (x1,  hy1, hx1 - x1, hy2 - hy1),
+            (hx2, hy1, x2 - hx2, hy2 - hy1),
+            ]
+        return [strip for strip in strips if strip[2] > 0 and strip[3] > 0]
+
+
+    @staticmethod
+    def begin_write(drawable, covered=None):
+        '''
+        Return the shadow buffer of drawable, ready for writes of any rectangles.
+
+        Merging the shadow replaces the drawable within the bounds of the selection,
+        so the shadow starts as a copy of the drawable within those bounds.
+        covered: rect the caller will write entirely, when known.
+        It is not copied, since it would be overwritten.
+        When it contains the bounds, nothing is copied.
+
+        !!! Not cheap: in a plugin, the buffer and the shadow are separate buffers backed by Gimp,
+        so the copy sends each tile to Gimp and back.
+        Writing a small rect of a large drawable without a selection still copies nearly all of it.
+        '''
+        shadow = drawable.get_shadow_buffer()
+        bounds = FuPixelBuffer.mask_bounds(drawable)
+        if bounds is None:
+            # Merge changes nothing
+            return shadow
+        if covered is None:
+            copies = [bounds]
+        else:
+            copies = FuPixelBuffer.subtract_rect(bounds, covered)
+
+        if FuPixelBuffer.log_switch.info:
+            FuPixelBuffer.logger.info("begin_write copies: %s", copies)
+        for rect in copies:
+            FuPixelBuffer.restore_rect(drawable, shadow, rect)
+        return shadow
+
+
+    @staticmethod
+    def finish_write(drawable, shadow, rect):
+        ''' Flush shadow, merge it into drawable, and update rect (of drawable coordinates.) '''
+        shadow.flush()
+        # True: push an undo step
+        drawable.merge_shadow(True)
+        drawable.update(*rect)
+
+
+
+    '''
+    Drawable level.
+    '''
+
+    @staticmethod
+    def get_array(drawable, rect=None, format=None):
+        '''
+        Return array of shape (height, width, channels) of pixels of rect of drawable, or None.
+
+        format: a babl format name e.g. "R'G'B'A float", default the model of drawable in u8.
+        rect: (x, y, width, height), default all of drawable.
+
+        !!! The array is read-only, a view of one bulk read.
+        Copy it (array.copy()) to modify it in place.
+        '''
+        pixel_format = FuPixelFormat.for_drawable(drawable, format)
+        if pixel_format is None:
+            return None
+        rect = FuPixelBuffer.clip_rect(drawable, rect)
+        if rect is None:
+            return None
+
+        if FuPixelBuffer.log_switch.info:
+            FuPixelBuffer.logger.info("get_array rect: %s format: %s", rect, pixel_format.name)
+        return FuPixelBuffer.read_rect(drawable.get_buffer(), rect, pixel_format)
+
+
+    @staticmethod
+    def set_array(drawable, array, x=0, y=0, format=None):
+        '''
+        Write array into drawable with its top left at (x, y), via the shadow buffer.
+
+        array has shape (height, width, channels), or (height, width) for one channel.
+        format: a babl format name, default the model of drawable in the sample type of array's dtype.
+        '''
+        pixel_format = FuPixelFormat.for_drawable(drawable, format, array.dtype)
+        if pixel_format is None:
+            return
+
+        channels = array.shape[2] if array.ndim == 3 else 1
+        if array.ndim not in (2, 3) or channels != pixel_format.channels:
+            proceed(f"Shape of array: {array.shape} does not match format: {pixel_format.name}.")
+            return
+
+        height, width = array.shape[:2]
+        rect = (x, y, width, height)
+        if FuPixelBuffer.clip_rect(drawable, rect) != rect:
+            proceed(f"Array at: {x}, {y} of shape {array.shape} exceeds the drawable.")
+            return
+
+        if FuPixelBuffer.log_switch.info:
+            FuPixelBuffer.logger.info("set_array rect: %s format: %s", rect, pixel_format.name)
+        shadow = FuPixelBuffer.begin_write(drawable, covered=rect)
+        if FuPixelBuffer.write_rect(shadow, rect, pixel_format, array):
+            FuPixelBuffer.finish_write(drawable, shadow, rect)
+        # else rect of shadow was not seeded, don't merge it
@@ -0,0 +1,145 @@
+
+from gimpfu.message.proceed import proceed
+
+import logging
+
+# NumPy is optional for GimpFu, but required for pixels
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+
+class FuPixelFormat():
+    '''
+    A babl pixel format, as understood by GEGL buffers, e.g. "R'G'B'A u8".
+    And the NumPy layout of its pixels: dtype, and count of channels.
+
+    A format name is a color model, then a space, then a sample type.
+    A prime (') in the model means perceptual (non-linear) components.
+    See babl documentation.
+
+    An array of pixels has shape (height, width, channels).
+    '''
+
+    logger = logging.getLogger("GimpFu.FuPixelFormat")
+
+    # sample type of babl => NumPy dtype name
+    _sample_dtypes = {
+        'u8'     : 'uint8',
+        'u16'    : 'uint16',
+        'u32'    : 'uint32',
+        'half'   : 'float16',
+        'float'  : 'float32',
+        'double' : 'float64',
+        }
+    _dtype_samples = { dtype : sample for sample, dtype in _sample_dtypes.items() }
+
+    # color model of babl, primes removed => count of channels
+    _model_channels = {
+        'RGB'           : 3,
+        'RGBA'          : 4,
+        'RaGaBaA'       : 4,
+        'Y'             : 1,
+        'YA'            : 2,
+        'YaA'           : 2,
+        'CIE Lab'       : 3,
+        'CIE Lab alpha' : 4,
+        }
+
+    __slots__ = ('name', 'dtype', 'channels')
+
+    def __init__(self, name):
+        '''
+        Raises ValueError when name is not a format GimpFu understands.
+        '''
+        model, _, sample = name.rpartition(' ')
+        channels = FuPixelFormat._model_channels.get(model.replace("'", ''))
+        dtype_name = FuPixelFormat._sample_dtypes.get(sample)
+        if channels is None or dtype_name is None:
+            raise ValueError(f"Unsupported pixel format: {name}")
+
+        self.name = name
+        self.dtype = numpy.dtype(dtype_name)
+        self.channels = channels
+
+
+    def __repr__(self):
+        return f"<FuPixelFormat {self.name}>"
+
+
+    @property
+    def bytes_per_pixel(self):
+        return self.dtype.itemsize * self.channels
+
+
+    def array_from_bytes(self, data, width, height, writable=False):
+        '''
+        Return array of shape (height, width, channels) of data.
+
+        Not writable: a read-only view of data (bytes), without copy.
+        Writable: a copy of data, that the caller can modify in place.
+        '''
+        if writable:
+            data = bytearray(data)
+        return numpy.frombuffer(data, dtype=self.dtype).reshape(height, width, self.channels)
+
+
+    def bytes_from_array(self, array):
+        '''
+        Return bytes of the pixels of array, in this format.
+
+        array has shape (height, width, channels), or (height, width) when one channel.
+        Coerces dtype when it differs (with NumPy's casting rules.)
+        '''
+        contiguous = numpy.ascontiguousarray(array, dtype=self.dtype)
+        # PyGObject copies bytes in one memcpy, but other sequences item by item
+        return contiguous.tobytes()
+
+
+
+    '''
+    Choosing a format.
+    '''
+
+    @staticmethod
+    def model_for_drawable(drawable):
+        ''' Return babl color model name of the pixels of drawable (a Gimp.Drawable), e.g. "R'G'B'A" '''
+        if drawable.is_gray():
+            model = "Y'"
+        else:
+            # rgb, or indexed, which GEGL converts to rgb
+            model = "R'G'B'"
+        if drawable.has_alpha():
+            model += "A"
+        return model
+
+
+    @staticmethod
+    def for_drawable(drawable, format=None, dtype=None):
+        '''
+        Return FuPixelFormat for reading or writing drawable, or None (after proceed) when format is not supported.
+
+        format: a babl format name.  When None, the model of drawable,
+        with the sample type of dtype (a NumPy dtype,) else u8.
+        '''
+        if numpy is None:
+            proceed("Access to pixels requires NumPy, not installed.")
+            return None
+
+        if format is None:
+            if dtype is None:
+                sample = 'u8'
+            else:
+                sample = FuPixelFormat._dtype_samples.get(numpy.dtype(dtype).name)
+                if sample is None:
+                    proceed(f"Unsupported dtype of pixels: {dtype}.")
+                    return None
+            format = FuPixelFormat.model_for_drawable(drawable) + ' ' + sample
+
+        try:
+            return FuPixelFormat(format)
+        except ValueError as err:
+            proceed(str(err))
+            return None
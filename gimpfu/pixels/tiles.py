@@ -0,0 +1,194 @@
+
+from gimpfu.pixels.pixel_format import FuPixelFormat
+from gimpfu.pixels.pixel_buffer import FuPixelBuffer
+from gimpfu.pixels.halo import FuHaloReader
+from gimpfu.message.proceed import proceed
+
+import logging
+
+
+
+class FuTiles():
+    '''
+    Iterates over a drawable in tiles: (rect, array) in scan order.
+
+    For drawables too big to hold in one array.
+    Each tile is read from the GEGL buffer when the iteration reaches it, not before,
+    and the iterator keeps no reference to previous tiles,
+    so peak memory is one or two tiles, whatever the size of the drawable.
+
+    An Author can modify a tile in place and write it back:
+
+        tiles = drawable.tiles(tile_size=512)
+        for rect, tile in tiles:
+            tile[..., 0] = 255
+            tiles.write(tile)
+
+    Writes go to the shadow buffer.
+    When the iteration is exhausted, the shadow is merged once (one undo step)
+    and the written area updated.
+    The shadow is not seeded with the area up front, only parts of the area that were not written
+    are copied from the drawable, when finished.  So a pass that writes every tile copies nothing.
+    When an Author leaves the loop early, use "with" (or call finish()) to merge:
+
+        with drawable.tiles() as tiles:
+            for rect, tile in tiles:
+                ...
+
+    With a halo r, a tile has r pixels of context on each side (see FuHaloReader),
+    rect is still the core, and an Author writes only the core:
+
+        tiles = drawable.tiles(halo=2)
+        for rect, tile in tiles:
+            tiles.write(blur(tile)[2:-2, 2:-2])
+    '''
+
+    logger = logging.getLogger("GimpFu.FuTiles")
+
+    def __init__(self, drawable, tile_size=256, rect=None, format=None, writable=True, halo=0):
+        '''
+        drawable is-a Gimp.Drawable (unwrapped.)
+        tile_size is an int, or a tuple (width, height).
+        rect is the area to iterate, default all of drawable.
+        format is a babl format name, default the model of drawable in u8.
+        writable: tiles are copies that can be modified in place, else read-only views.
+        halo: count of pixels of context around each tile.  Tiles with halo are always writable.
+        '''
+        self._drawable = drawable
+        if isinstance(tile_size, int):
+            tile_size = (tile_size, tile_size)
+        self._tile_size = tile_size
+        self._pixel_format = FuPixelFormat.for_drawable(drawable, format)
+        self._rect = FuPixelBuffer.clip_rect(drawable, rect)
+        self._writable = writable
+        self._halo = halo
+
+        # rect of the tile last yielded
+        self._current_rect = None
+        # shadow buffer, when any tile was written
+        self._shadow = None
+        # bounding box (x1, y1, x2, y2) of written tiles
+        self._written_bounds = None
+        # rects written
+        self._written = set()
+
+
+    def __repr__(self):
+        return f"<FuTiles {self._rect} tile size: {self._tile_size} halo: {self._halo} format: {self._pixel_format}>"
+
+
+    @staticmethod
+    def tile_rects(rect, tile_size):
+        ''' Generate rects of tiles of tile_size (width, height) covering rect, in scan order.  Edge tiles are smaller. '''
+        x, y, width, height = rect
+        tile_width, tile_height = tile_size
+        for tile_y in range(y, y + height, tile_height):
+            this_height = min(tile_height, y + height - tile_y)
+            for tile_x in range(x, x + width, tile_width):
+                yield (tile_x, tile_y, min(tile_width, x + width - tile_x), this_height)
+
+
+    @property
+    def pixel_format(self):
+        return self._pixel_format
+
+
+    def rects(self):
+        ''' Generate rects of tiles, without reading pixels. '''
+        if self._rect is None:
+            return iter(())
+        return FuTiles.tile_rects(self._rect, self._tile_size)
+
+
+    def __iter__(self):
+        if self._pixel_format is None or self._rect is None:
+            # proceeded earlier
+            return
+        if self._halo:
+            reader = FuHaloReader(self._drawable, self._pixel_format, self._tile_size, self._halo, self._rect)
+            read = reader.read
+        else:
+            buffer = self._drawable.get_buffer()
+            read = lambda rect : FuPixelBuffer.read_rect(buffer, rect, self._pixel_format, self._writable)
+
+        for rect in self.rects():
+            self._current_rect = rect
+            tile = read(rect)
+            yield rect, tile
+            # drop our reference before reading the next tile
+            del tile
+        self._current_rect = None
+        if self._halo:
+            reader.finish()
+        self.finish()
+
+
+    def write(self, tile, rect=None):
+        '''
+        Write tile back to the drawable (via the shadow buffer), at rect, default the current tile's rect.
+        '''
+        if rect is None:
+            rect = self._current_rect
+        if rect is None:
+            proceed("Write of a tile outside an iteration of tiles.")
+            return
+        if self._shadow is None:
+            # Seeds only outside the area, the area is written or restored at finish()
+            self._shadow = FuPixelBuffer.begin_write(self._drawable, covered=self._rect)
+        if FuPixelBuffer.write_rect(self._shadow, rect, self._pixel_format, tile):
+            self._written.add(rect)
+            self._include_written(rect)
+
+
+    def _include_written(self, rect):
+        x, y, width, height = rect
+        bounds = (x, y, x + width, y + height)
+        if self._written_bounds is None:
+            self._written_bounds = bounds
+        else:
+            old = self._written_bounds
+            self._written_bounds = (min(old[0], bounds[0]), min(old[1], bounds[1]),
+                                    max(old[2], bounds[2]), max(old[3], bounds[3]))
+
+
+    def _restore_unwritten(self):
+        ''' Copy parts of the area (within the selection bounds) that were not written into the shadow. '''
+        bounds = FuPixelBuffer.mask_bounds(self._drawable)
+        if bounds is None:
+            return
+        tiles = set(self.rects())
+        # written rects not on the grid of tiles, e.g. by write(tile, rect)
+        irregular = [rect for rect in self._written if rect not in tiles]
+        for tile_rect in tiles:
+            if tile_rect in self._written:
+                continue
+            piece = FuPixelBuffer.intersect_rect(tile_rect, bounds)
+            if piece is None:
+                continue
+            pieces = [piece]
+            for written in irregular:
+                pieces = [part for piece in pieces for part in FuPixelBuffer.subtract_rect(piece, written)]
+            for piece in pieces:
+                FuPixelBuffer.restore_rect(self._drawable, self._shadow, piece)
+
+
+    def finish(self):
+        ''' Merge written tiles into the drawable and update, once.  Idempotent. '''
+        if self._shadow is None:
+            return
+        if self._written_bounds is not None:
+            self._restore_unwritten()
+            x1, y1, x2, y2 = self._written_bounds
+            FuPixelBuffer.finish_write(self._drawable, self._shadow, (x1, y1, x2 - x1, y2 - y1))
+        # else no write succeeded, nothing to merge
+        self._shadow = None
+        self._written_bounds = None
+        self._written = set()
+
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.finish()
+        return False
@@ -9,6 +9,7 @@ from gi.repository import Gimp
 from gimpfu.runner.runner import FuRunner
 from gimpfu.procedure.procedure_creator import FuProcedureCreator
 from gimpfu.procedures.procedures import FuProcedures
+from gimpfu.gimppdb.gimppdb import GimpPDB
 
 
 import logging
@@ -125,5 +126,9 @@ class FuPlugin (Gimp.PlugIn):
             FuRunner.run_context_procedure,
             FuRunner.run_other_procedure)
 
+        # The procedure may be registered again (e.g. temporary procedures)
+        # possibly with a changed signature: forget any cached signature.
+        GimpPDB.invalidate_signature(name)
+
         # ensure result is-a Gimp.Procedure
         return procedure
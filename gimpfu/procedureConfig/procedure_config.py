@@ -206,7 +206,7 @@ class FuProcedureConfig():
         # Assert config length > 0.  Should not be called unless there one or more guiable args.
         assert value_array.length() > 0
 
-        values_list = Types.convert_gimpvaluearray_to_list_of_gvalue(value_array)
+        values_list = FuValueArray.to_list(value_array)
         wrapped_arg_list = Marshal.wrap_args(values_list)
         # assert values_list is a list of GValues, not prefixed with image, drawable
         self.logger.debug(f"get_list_of_wrapped_values: {wrapped_arg_list}")
@@ -218,21 +218,6 @@ class FuProcedureConfig():
         return self.get_list_of_wrapped_values()
 
 
-    '''
-    !!! you can't assign a GValue to a variable, PyGObject unmarshals it
-
-    array.index(index-2) = arg => SyntaxError: can't assign to function call
-    '''
-    def _set_value_at_index(self, array, value, index):
-        """ Set the value of the GValue at index of array """
-        '''
-        GimpValueArray lacks a setter, must remove and insert.
-        '''
-        # require value is-a GValue
-        # require array is-a Gimp.ValueArray
-        array.remove(index)
-        array.insert(index, value)
-
     def debug_procedure_config(self):
         """ Check config vs procedure and log stuff. """
         self.logger.info(f">>>>> Attributes of procedure and its config")
@@ -286,12 +271,10 @@ class FuProcedureConfig():
         # !!! users_args is NOT prefixed with (runmode, image, drawable)
 
         configurable_args_values = users_args
-        dest_index = 0
+        self.logger.info(f"changed settings to values: {configurable_args_values}")
 
-        for value in configurable_args_values:
-            self.logger.info(f"changed setting at index: {dest_index} to value: {value}")
-            self._set_value_at_index(value_array, value, dest_index)
-            dest_index += 1
+        # In bulk, not remove and insert per setting
+        value_array = FuValueArray.replace_prefix(value_array, configurable_args_values)
 
         self.logger.info(f"Calling Gimp.ProcedureConfig.set_values")
         self._config.set_values(value_array)
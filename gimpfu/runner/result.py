@@ -122,7 +122,7 @@ class FuResult():
 
         # Use our GValue wrapper to do conversions of unwrapped result
         tempGValue = FuGenericValue(unwrappedResult, type(unwrappedResult))
-        tempGValue.tryConversionsAndUpcasts(formalType)
+        tempGValue.tryConversionsAndUpcasts(formalType, formalType)
 
         finalValue = tempGValue.get_gvalue()
         FuResult.logger.info(f"final value {finalValue}")
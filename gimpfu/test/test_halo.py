@@ -0,0 +1,149 @@
+"""
+Test FuHaloReader (tiles with halo) and FuTiles.tile_rects against a fake GEGL buffer.
+
+The fake buffer holds a NumPy image and answers get() like a Gegl.Buffer,
+clamping beyond its extent as Gegl.AbyssPolicy.CLAMP does.
+The expected tile with halo is a slice of the image padded with numpy.pad(mode='edge').
+
+Usage:
+    python3 -m pytest gimpfu/test
+"""
+
+import pytest
+
+# Importing gimpfu requires PyGObject and the Gimp typelib
+pytest.importorskip("gi")
+numpy = pytest.importorskip("numpy")
+
+from gimpfu.pixels.pixel_format import FuPixelFormat
+from gimpfu.pixels.tiles import FuTiles
+from gimpfu.pixels.halo import FuHaloReader
+
+
+
+class _FakeBuffer():
+    """ Answers get() of a Gegl.Buffer from a NumPy image, and counts gets. """
+    def __init__(self, image):
+        self.image = image
+        self.gets = []
+
+    def get(self, rectangle, scale, format, abyss):
+        self.gets.append((rectangle.x, rectangle.y, rectangle.width, rectangle.height))
+        height, width = self.image.shape[:2]
+        rows = numpy.clip(numpy.arange(rectangle.y, rectangle.y + rectangle.height), 0, height - 1)
+        columns = numpy.clip(numpy.arange(rectangle.x, rectangle.x + rectangle.width), 0, width - 1)
+        return self.image[numpy.ix_(rows, columns)].tobytes()
+
+
+class _FakeDrawable():
+    """ What FuHaloReader uses of a Gimp.Drawable. """
+    def __init__(self, image):
+        self.buffer = _FakeBuffer(image)
+        self.height, self.width = image.shape[:2]
+
+    def get_buffer(self):
+        return self.buffer
+
+    def get_width(self):
+        return self.width
+
+    def get_height(self):
+        return self.height
+
+
+
+def _image(width, height):
+    ''' Return RGB u8 image whose pixels differ, so a misplaced pixel is detected. '''
+    values = numpy.arange(width * height * 3, dtype=numpy.uint32) * 7919 % 251
+    return values.astype(numpy.uint8).reshape(height, width, 3)
+
+
+def _covered(rects):
+    ''' Return set of pixels covered by rects, asserting they don't overlap. '''
+    pixels = set()
+    for x, y, width, height in rects:
+        tile = {(column, row) for column in range(x, x + width) for row in range(y, y + height)}
+        assert not pixels & tile
+        pixels |= tile
+    return pixels
+
+
+
+@pytest.mark.parametrize("rect, tile_size", [
+    ((0, 0, 35, 25), (10, 10)),
+    ((5, 3, 40, 30), (16, 8)),
+    ((0, 0, 16, 16), (16, 16)),
+    ((2, 2, 3, 3), (16, 16)),
+    ])
+def test_tile_rects_cover_rect(rect, tile_size):
+    rects = list(FuTiles.tile_rects(rect, tile_size))
+    x, y, width, height = rect
+    assert _covered(rects) == _covered([rect])
+    # scan order, first tile at origin of rect, no tile larger than tile_size
+    assert rects == sorted(rects, key=lambda r: (r[1], r[0]))
+    assert rects[0][:2] == (x, y)
+    assert all(r[2] <= tile_size[0] and r[3] <= tile_size[1] for r in rects)
+
+
+def test_tile_rects_edge_tiles():
+    rects = list(FuTiles.tile_rects((0, 0, 35, 25), (10, 10)))
+    assert len(rects) == 4 * 3
+    assert rects[3] == (30, 0, 5, 10)
+    assert rects[8] == (0, 20, 10, 5)
+    assert rects[-1] == (30, 20, 5, 5)
+
+
+
+@pytest.mark.parametrize("area, tile_size, halo", [
+    # all of drawable: halos clamp at every border and corner
+    ((0, 0, 71, 53), (16, 16), 2),
+    ((0, 0, 71, 53), (16, 16), 16),
+    # halo larger than a tile
+    ((0, 0, 71, 53), (16, 16), 20),
+    ((0, 0, 71, 53), (32, 8), 3),
+    # sub area: halo above and left of area is negative rows and columns of the grid
+    ((5, 3, 40, 30), (16, 16), 4),
+    ((60, 45, 11, 8), (4, 4), 6),
+    ])
+def test_halo_equals_edge_padding(area, tile_size, halo):
+    image = _image(71, 53)
+    drawable = _FakeDrawable(image)
+    reader = FuHaloReader(drawable, FuPixelFormat("R'G'B' u8"), tile_size, halo, area)
+    padded = numpy.pad(image, ((halo, halo), (halo, halo), (0, 0)), mode='edge')
+
+    for x, y, width, height in FuTiles.tile_rects(area, tile_size):
+        tile = reader.read((x, y, width, height))
+        # padded is offset by halo, so the tile with halo starts at (x, y) in padded
+        assert numpy.array_equal(tile, padded[y:y + height + 2 * halo, x:x + width + 2 * halo])
+        assert numpy.array_equal(FuHaloReader.core(tile, halo), image[y:y + height, x:x + width])
+        assert tile.flags.writeable
+
+
+@pytest.mark.parametrize("area, tile_size, halo", [
+    ((0, 0, 71, 53), (16, 16), 2),
+    ((0, 0, 71, 53), (16, 16), 20),
+    ((5, 3, 40, 30), (16, 16), 4),
+    ((0, 0, 200, 40), (8, 8), 3),
+    ])
+def test_scan_reads_each_block_once(area, tile_size, halo):
+    image = _image(71, 53) if area[2] <= 71 else _image(200, 40)
+    drawable = _FakeDrawable(image)
+    reader = FuHaloReader(drawable, FuPixelFormat("R'G'B' u8"), tile_size, halo, area)
+    for rect in FuTiles.tile_rects(area, tile_size):
+        reader.read(rect)
+
+    # blocks: the grid of tiles of area, over the area and its halo, clipped to drawable
+    x, y, width, height = area
+    halo_rect = (max(x - halo, 0), max(y - halo, 0))
+    halo_rect += (min(x + width + halo, drawable.width) - halo_rect[0],
+                  min(y + height + halo, drawable.height) - halo_rect[1])
+    tile_width, tile_height = tile_size
+    columns = range((halo_rect[0] - x) // tile_width, (halo_rect[0] + halo_rect[2] - 1 - x) // tile_width + 1)
+    rows = range((halo_rect[1] - y) // tile_height, (halo_rect[1] + halo_rect[3] - 1 - y) // tile_height + 1)
+    blocks = len(columns) * len(rows)
+
+    assert reader.misses == blocks
+    assert len(drawable.buffer.gets) == blocks
+    # each block read once, none overlapping
+    assert len(set(drawable.buffer.gets)) == blocks
+    _covered(drawable.buffer.gets)